@@ -0,0 +1,139 @@
+"""
+Microbenchmark for checkout session (de)serialization.
+
+Usage:
+    python -m benchmarks.bench_checkout_parsing
+    python -m benchmarks.bench_checkout_parsing --line-items 10 200 1000
+
+Compares parsing a response with `json.loads` + `model_validate` (the old
+dict path) against `model_validate_json` on the raw bytes, and building a
+request body with `model_dump(mode="json")` + `json.dumps` (what httpx does
+for `json=`) against serializing the model straight to bytes.
+"""
+
+import argparse
+import json
+import time
+
+from services.checkout.schemas import (
+    CheckoutSessionUpdateRequest,
+    CheckoutSessionWithOrder,
+)
+
+
+def session_payload(line_items: int) -> bytes:
+    session = {
+        "id": "cs_123",
+        "status": "completed",
+        "currency": "usd",
+        "buyer": {
+            "first_name": "Ada",
+            "last_name": "Lovelace",
+            "email": "ada@example.com",
+        },
+        "payment_provider": {"provider": "stripe", "supported_payment_methods": ["card"]},
+        "line_items": [
+            {
+                "id": f"li_{i}",
+                "item": {"id": f"sku_{i}", "quantity": 1 + i % 3},
+                "base_amount": 1999,
+                "discount": 0,
+                "subtotal": 1999,
+                "tax": 160,
+                "total": 2159,
+            }
+            for i in range(line_items)
+        ],
+        "fulfillment_address": {
+            "name": "Ada Lovelace",
+            "line_one": "1 Main St",
+            "city": "San Francisco",
+            "state": "CA",
+            "country": "US",
+            "postal_code": "94105",
+        },
+        "fulfillment_options": [
+            {
+                "type": "shipping",
+                "id": f"ship_{i}",
+                "title": "Standard",
+                "carrier": "UPS",
+                "earliest_delivery_time": "2025-10-01T00:00:00Z",
+                "latest_delivery_time": "2025-10-05T00:00:00Z",
+                "subtotal": 500,
+                "tax": 0,
+                "total": 500,
+            }
+            for i in range(5)
+        ],
+        "fulfillment_option_id": "ship_0",
+        "totals": [
+            {"type": "subtotal", "display_text": "Subtotal", "amount": 1999 * line_items},
+            {"type": "total", "display_text": "Total", "amount": 2159 * line_items},
+        ],
+        "messages": [
+            {"type": "info", "content_type": "plain", "content": "Thanks!"},
+        ],
+        "links": [{"type": "terms_of_use", "url": "https://shop.example.com/terms"}],
+        "order": {
+            "id": "ord_1",
+            "checkout_session_id": "cs_123",
+            "permalink_url": "https://shop.example.com/orders/1",
+        },
+    }
+    return json.dumps(session).encode("utf-8")
+
+
+def timed_us(fn, repeat: int) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--line-items", type=int, nargs="+", default=[10, 200, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(
+        f"{'items':>6}{'KB':>8}{'dict parse us':>15}{'raw parse us':>14}"
+        f"{'dict dump us':>14}{'raw dump us':>13}"
+    )
+    for line_items in args.line_items:
+        raw = session_payload(line_items)
+        session = CheckoutSessionWithOrder.model_validate_json(raw)
+        update = CheckoutSessionUpdateRequest(
+            buyer=session.buyer,
+            items=[line.item for line in session.line_items],
+            fulfillment_address=session.fulfillment_address,
+        )
+        repeat = max(1, args.repeat * 100 // line_items)
+
+        timings = [
+            timed_us(
+                lambda: CheckoutSessionWithOrder.model_validate(json.loads(raw)), repeat
+            ),
+            timed_us(lambda: CheckoutSessionWithOrder.model_validate_json(raw), repeat),
+            timed_us(
+                lambda: json.dumps(
+                    update.model_dump(mode="json", exclude_unset=True)
+                ).encode("utf-8"),
+                repeat,
+            ),
+            timed_us(
+                lambda: update.model_dump_json(exclude_unset=True).encode(),
+                repeat,
+            ),
+        ]
+        print(
+            f"{line_items:>6}{len(raw) / 1024:>8.1f}"
+            f"{timings[0]:>15.1f}{timings[1]:>14.1f}"
+            f"{timings[2]:>14.1f}{timings[3]:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
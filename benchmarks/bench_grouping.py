@@ -0,0 +1,124 @@
+"""
+Per-document cost of grouping search results into product cards.
+
+Usage:
+    python -m benchmarks.bench_grouping
+    python -m benchmarks.bench_grouping --k 5 50 500 --repeat 200
+
+Compares the previous per-document model round trip (validate a Product,
+build a ProductVariant, dump, build a ProductCard) with the dict partition
+used for store results and with the same partition plus one batched
+TypeAdapter validation.
+"""
+
+import argparse
+import random
+import time
+
+from langchain_core.documents import Document
+
+from services.models import Product
+from services.responses.schemas import ProductCard, ProductVariant
+from services.responses.tools import documents_to_grouped_cards
+
+
+def synthetic_documents(k: int, rng: random.Random) -> list[Document]:
+    docs = []
+    for i in range(k):
+        group = i // 3
+        metadata = {
+            "enable_search": "true",
+            "enable_checkout": "true",
+            "id": f"SKU-{i:05d}",
+            "mpn": f"MPN-{i:05d}",
+            "title": f"Trail Shoe {group}",
+            "link": f"https://shop.example.com/p/{i}",
+            "product_category": "Apparel & Accessories > Shoes",
+            "brand": rng.choice(["Acme", "Northwind", "Contoso"]),
+            "material": "mesh",
+            "weight": "0.8 lb",
+            "image_link": f"https://shop.example.com/img/{i}.jpg",
+            "price": f"{rng.randint(50, 200)}.00 USD",
+            "availability": "in_stock",
+            "inventory_quantity": rng.randint(0, 50),
+            "item_group_id": f"GROUP-{group:05d}",
+            "item_group_title": f"Trail Shoe {group}",
+            "color": rng.choice(["red", "blue", "black"]),
+            "size": str(rng.randint(6, 13)),
+            "seller_name": "Example Shop",
+            "seller_url": "https://shop.example.com",
+            "return_policy": "https://shop.example.com/returns",
+            "return_window": 30,
+            "product_review_count": rng.randint(0, 900),
+            "product_review_rating": round(rng.uniform(1, 5), 1),
+        }
+        docs.append(
+            Document(page_content="Lightweight trail running shoe. " * 20, metadata=metadata)
+        )
+    return docs
+
+
+def legacy_grouped_cards(docs: list[Document]) -> list[dict]:
+    """The per-document model round trip, kept here as the baseline."""
+    variant_fields = ProductVariant.model_fields
+    grouped: dict[str, dict] = {}
+    for doc in docs:
+        product = Product.model_validate({**doc.metadata, "description": doc.page_content})
+        group_id = product.item_group_id or product.id
+        variant = ProductVariant(
+            sku=product.id,
+            **{f: getattr(product, f) for f in variant_fields if hasattr(product, f)},
+        )
+        entry = grouped.setdefault(group_id, {"variants": [], "card_fields": None})
+        entry["variants"].append(variant)
+        if entry["card_fields"] is None:
+            product_dict = product.model_dump()
+            entry["card_fields"] = {
+                f: v
+                for f, v in product_dict.items()
+                if f in ProductCard.model_fields and f not in variant_fields
+            }
+
+    return [
+        ProductCard(**data["card_fields"], variants=data["variants"]).model_dump(
+            mode="json"
+        )
+        for data in grouped.values()
+    ]
+
+
+def per_document_us(fn, docs: list[Document], repeat: int) -> float:
+    fn(docs)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(docs)
+    return (time.perf_counter() - started) / (repeat * len(docs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--k", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    paths = {
+        "legacy": legacy_grouped_cards,
+        "partition": documents_to_grouped_cards,
+        "validated": lambda docs: documents_to_grouped_cards(docs, validate=True),
+    }
+
+    print(f"{'k':>5}" + "".join(f"{name + ' us/doc':>18}" for name in paths) + f"{'speedup':>10}")
+    for k in args.k:
+        docs = synthetic_documents(k, rng)
+        repeat = max(1, args.repeat * 50 // k)
+        timings = {name: per_document_us(fn, docs, repeat) for name, fn in paths.items()}
+        print(
+            f"{k:>5}"
+            + "".join(f"{timings[name]:>18.2f}" for name in paths)
+            + f"{timings['legacy'] / timings['partition']:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Recall-vs-memory report for vector quantization modes.
+
+Usage:
+    python -m benchmarks.quantization_report --snapshot .cache/catalog
+    python -m benchmarks.quantization_report --rows 20000 --dimensions 1024
+
+With --snapshot, vectors come from a memory store snapshot (vectors.npy)
+and a random sample of them, slightly perturbed, is used as queries.
+Otherwise a synthetic clustered corpus is generated.
+"""
+
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from libs.core.stores.quantization import quantization_report
+
+
+def synthetic_vectors(rows: int, dimensions: int, rng: np.random.Generator):
+    centers = rng.normal(size=(max(rows // 50, 1), dimensions))
+    labels = rng.integers(0, len(centers), size=rows)
+    return (centers[labels] + 0.5 * rng.normal(size=(rows, dimensions))).astype(
+        np.float32
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--snapshot", help="memory store snapshot directory")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--dimensions", type=int, default=1024)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.snapshot:
+        vectors = np.load(Path(args.snapshot) / "vectors.npy", mmap_mode="r")
+    else:
+        vectors = synthetic_vectors(args.rows, args.dimensions, rng)
+
+    sample = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    queries = vectors[sample] + 0.1 * rng.normal(size=(len(sample), vectors.shape[1]))
+
+    report = quantization_report(
+        vectors, queries, k=args.k, rescore_factor=args.rescore_factor
+    )
+
+    print(f"{len(vectors)} vectors x {vectors.shape[1]} dims, recall@{args.k}")
+    print(f"{'mode':<8}{'bytes/vec':>10}{'index MB':>10}{'recall':>9}{'rescored':>10}")
+    for row in report:
+        print(
+            f"{row.mode:<8}{row.bytes_per_vector:>10}"
+            f"{row.index_bytes / 2**20:>10.1f}"
+            f"{row.recall:>9.3f}{row.recall_rescored:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -16,10 +16,13 @@ def load_settings():
 
     settings = PegasusSettings.model_validate(config_data)
 
-    embed_api_key = os.environ.get("EMBEDDINGS_MODEL_API_KEY")
-    if embed_api_key is None:
-        raise RuntimeError("EMBEDDINGS_MODEL_API_KEY environment variable is required")
-    settings.store.embeddings.api_key = embed_api_key
+    if settings.store.embeddings.provider != "hashing":
+        embed_api_key = os.environ.get("EMBEDDINGS_MODEL_API_KEY")
+        if embed_api_key is None:
+            raise RuntimeError(
+                "EMBEDDINGS_MODEL_API_KEY environment variable is required"
+            )
+        settings.store.embeddings.api_key = embed_api_key
 
     chat_api_key = os.environ.get("CHAT_MODEL_API_KEY")
     if chat_api_key is None:
@@ -1,13 +1,88 @@
-from langchain.messages import HumanMessage
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Literal
+
+from langchain.messages import AIMessage, AIMessageChunk, HumanMessage
 
 from langgraph.graph.state import CompiledStateGraph
 
 from libs.core.context import AgentContext
 
+MODEL_NODE = "model"
+# Middleware hooks run as their own nodes; only these are agent steps
+STEP_NODES = (MODEL_NODE, "tools")
+
+
+@dataclass
+class AgentEvent:
+    """
+    A streamed agent event.
+
+    `token` events carry a text delta from the model as it is generated
+    (the whole text at once for models that do not stream); `step` events
+    carry the state update the model or tools node produced when it
+    finished.
+    """
+
+    type: Literal["token", "step"]
+    node: str
+    data: Any
+
 
 class Agent:
     def __init__(self, agent: CompiledStateGraph):
         self.agent = agent
+        # Runs without a thread are one-off and leave no checkpoints behind
+        self._stateless = (
+            agent if agent.checkpointer is None else agent.copy({"checkpointer": None})
+        )
+
+    async def arun(
+        self, input: str, context: AgentContext, thread_id: str | None = None
+    ) -> str:
+        return await self._graph(thread_id).ainvoke(
+            input={"messages": [HumanMessage(input)]},
+            context=context,
+            config=self._config(thread_id),
+        )
+
+    async def astream(
+        self, input: str, context: AgentContext, thread_id: str | None = None
+    ) -> AsyncIterator[AgentEvent]:
+        streamed = False
+        async for mode, chunk in self._graph(thread_id).astream(
+            input={"messages": [HumanMessage(input)]},
+            context=context,
+            config=self._config(thread_id),
+            stream_mode=["messages", "updates"],
+        ):
+            if mode == "messages":
+                message, metadata = chunk
+                if (
+                    metadata.get("langgraph_node") != MODEL_NODE
+                    or not isinstance(message, AIMessage)
+                    or not message.text
+                ):
+                    continue
+                if isinstance(message, AIMessageChunk):
+                    streamed = True
+                elif streamed:
+                    continue
+                # Non-streaming models deliver the whole answer as one message
+                yield AgentEvent(type="token", node=MODEL_NODE, data=message.text)
+            else:
+                for node, update in chunk.items():
+                    if node not in STEP_NODES:
+                        continue
+                    if node == MODEL_NODE:
+                        streamed = False
+                    yield AgentEvent(type="step", node=node, data=update)
+
+    def _graph(self, thread_id: str | None) -> CompiledStateGraph:
+        return self.agent if thread_id else self._stateless
 
-    def run(self, input: str, context: AgentContext) -> str:
-        return self.agent.invoke(input={"messages": [HumanMessage(input)]}, context=context)
+    def _config(self, thread_id: str | None) -> dict:
+        # With a checkpointer, prior turns of the thread are restored and
+        # only the new message is sent
+        if thread_id is None or self.agent.checkpointer is None:
+            return {}
+        return {"configurable": {"thread_id": thread_id}}
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from typing import Annotated, Any, Literal
+
+from langchain.agents.middleware import AgentMiddleware, AgentState, hook_config
+from langchain.agents.middleware.types import PrivateStateAttr
+from langchain.messages import SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.channels.untracked_value import UntrackedValue
+from typing_extensions import NotRequired
+
+BudgetLimit = Literal["iterations", "deadline", "tokens"]
+
+WRAP_UP_PROMPT = (
+    "The budget for this request is used up. Do not call any more tools; "
+    "answer now using only the results you already have, and say briefly "
+    "if they may be incomplete."
+)
+
+TOOL_TIMEOUT_MESSAGE = (
+    "Stopped: the time budget for this request ran out before this tool "
+    "finished."
+)
+
+
+class RunBudgetState(AgentState):
+    run_started_at: NotRequired[Annotated[float, UntrackedValue, PrivateStateAttr]]
+    run_model_calls: NotRequired[Annotated[int, UntrackedValue, PrivateStateAttr]]
+    run_tokens: NotRequired[Annotated[int, UntrackedValue, PrivateStateAttr]]
+    limit_reached: NotRequired[BudgetLimit | None]
+
+
+class RunBudgetMiddleware(AgentMiddleware[RunBudgetState, Any]):
+    """
+    Caps each agent run by model calls, wall-clock time and tokens.
+
+    Limits are checked before every model call. Once one is reached, the
+    model gets one last call with its tools removed and an instruction to
+    answer from what it has, so the run ends with a real answer instead of
+    an error. The run ends after that call even if the model asks for tools
+    anyway. The limit that triggered this is left in the run's
+    `limit_reached` state key (`None` when the run finished within budget).
+
+    In async runs `deadline_seconds` is also enforced while tools and the
+    model are running: a tool still running when time is up is cancelled
+    and reported to the model as stopped, and a model call that would
+    overrun is cancelled and replaced by the wrap-up call. The wrap-up
+    call itself is not timed, so a run can overrun by that one call.
+    Sync runs only check the deadline between steps.
+    """
+
+    state_schema = RunBudgetState
+
+    def __init__(
+        self,
+        *,
+        max_iterations: int | None = None,
+        deadline_seconds: float | None = None,
+        token_budget: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.max_iterations = max_iterations
+        self.deadline_seconds = deadline_seconds
+        self.token_budget = token_budget
+
+    def before_agent(self, state: RunBudgetState, runtime) -> dict[str, Any]:
+        return {
+            "run_started_at": time.monotonic(),
+            "run_model_calls": 0,
+            "run_tokens": 0,
+            "limit_reached": None,
+        }
+
+    async def abefore_agent(self, state: RunBudgetState, runtime) -> dict[str, Any]:
+        return self.before_agent(state, runtime)
+
+    def before_model(self, state: RunBudgetState, runtime) -> dict[str, Any] | None:
+        if state.get("limit_reached") is None and (limit := self._exceeded(state)):
+            return {"limit_reached": limit}
+        return None
+
+    async def abefore_model(
+        self, state: RunBudgetState, runtime
+    ) -> dict[str, Any] | None:
+        return self.before_model(state, runtime)
+
+    @hook_config(can_jump_to=["end"])
+    def after_model(self, state: RunBudgetState, runtime) -> dict[str, Any]:
+        message = state["messages"][-1]
+        usage = getattr(message, "usage_metadata", None)
+        # Providers without usage reporting are charged an estimate
+        tokens = usage["total_tokens"] if usage else count_tokens_approximately(
+            state["messages"]
+        )
+        update = {
+            "run_model_calls": state.get("run_model_calls", 0) + 1,
+            "run_tokens": state.get("run_tokens", 0) + tokens,
+        }
+        if state.get("limit_reached") is not None:
+            update["jump_to"] = "end"
+            if getattr(message, "tool_calls", None):
+                # Calls that will never run would leave the thread unanswerable
+                update["messages"] = [message.model_copy(update={"tool_calls": []})]
+        return update
+
+    @hook_config(can_jump_to=["end"])
+    async def aafter_model(self, state: RunBudgetState, runtime) -> dict[str, Any]:
+        return self.after_model(state, runtime)
+
+    def wrap_model_call(self, request, handler):
+        return handler(self._wrap_up(request))
+
+    async def awrap_model_call(self, request, handler):
+        remaining = self._remaining(request.state)
+        if request.state.get("limit_reached") is not None or remaining is None:
+            return await handler(self._wrap_up(request))
+
+        timeout = asyncio.timeout(remaining)
+        try:
+            async with timeout:
+                return await handler(request)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+        return await handler(self._final_call(request))
+
+    def wrap_tool_call(self, request, handler):
+        return handler(request)
+
+    async def awrap_tool_call(self, request, handler):
+        remaining = self._remaining(request.state)
+        if remaining is None:
+            return await handler(request)
+
+        timeout = asyncio.timeout(remaining)
+        try:
+            async with timeout:
+                return await handler(request)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+        return ToolMessage(
+            content=TOOL_TIMEOUT_MESSAGE,
+            tool_call_id=request.tool_call["id"],
+            name=request.tool_call["name"],
+            status="error",
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _exceeded(self, state: RunBudgetState) -> BudgetLimit | None:
+        if (
+            self.max_iterations is not None
+            and state.get("run_model_calls", 0) >= self.max_iterations
+        ):
+            return "iterations"
+        if (
+            self.deadline_seconds is not None
+            and time.monotonic() - state.get("run_started_at", time.monotonic())
+            >= self.deadline_seconds
+        ):
+            return "deadline"
+        if self.token_budget is not None and state.get("run_tokens", 0) >= self.token_budget:
+            return "tokens"
+        return None
+
+    def _remaining(self, state: RunBudgetState) -> float | None:
+        """Seconds left before the deadline, or None without one."""
+        if self.deadline_seconds is None or "run_started_at" not in state:
+            return None
+        elapsed = time.monotonic() - state["run_started_at"]
+        return self.deadline_seconds - elapsed
+
+    def _wrap_up(self, request):
+        if request.state.get("limit_reached") is None:
+            return request
+        return self._final_call(request)
+
+    def _final_call(self, request):
+        system = request.system_message
+        blocks = list(system.content_blocks) if system else []
+        return request.override(
+            tools=[],
+            tool_choice=None,
+            system_message=SystemMessage(
+                content=[*blocks, {"type": "text", "text": WRAP_UP_PROMPT}]
+            ),
+        )
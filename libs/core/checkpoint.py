@@ -0,0 +1,51 @@
+import time
+from collections import OrderedDict
+
+from langgraph.checkpoint.memory import InMemorySaver
+
+
+class ExpiringInMemorySaver(InMemorySaver):
+    """
+    In-process checkpointer that forgets threads idle for `ttl_seconds`.
+
+    Threads are kept in least-recently-used order, so each read or write
+    only has to look at the stale end of the list.
+    """
+
+    def __init__(self, ttl_seconds: float) -> None:
+        super().__init__()
+        self.ttl = ttl_seconds
+        self._last_seen: OrderedDict[str, float] = OrderedDict()
+
+    def get_tuple(self, config):
+        self._expire()
+        return super().get_tuple(config)
+
+    def list(self, config, **kwargs):
+        self._expire()
+        return super().list(config, **kwargs)
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self._touch(config["configurable"]["thread_id"])
+        self._expire()
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._last_seen.pop(thread_id, None)
+        super().delete_thread(thread_id)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _touch(self, thread_id: str) -> None:
+        self._last_seen[thread_id] = time.monotonic()
+        self._last_seen.move_to_end(thread_id)
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl
+        while self._last_seen:
+            thread_id, seen = next(iter(self._last_seen.items()))
+            if seen > cutoff:
+                break
+            self.delete_thread(thread_id)
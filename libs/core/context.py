@@ -1,6 +1,24 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from libs.core.settings import ToolOutputSettings
 from libs.core.stores.base import BaseStore
 
+
+@dataclass
+class ToolOutputStats:
+    """Running totals of the tokens tool output would cost in full vs. compact."""
+
+    calls: int = 0
+    full_tokens: int = 0
+    llm_tokens: int = 0
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.full_tokens - self.llm_tokens
+
+
 @dataclass
 class AgentContext:
-    store: BaseStore
\ No newline at end of file
+    store: BaseStore
+    tool_output: ToolOutputSettings = field(default_factory=ToolOutputSettings)
+    tool_stats: ToolOutputStats = field(default_factory=ToolOutputStats)
@@ -0,0 +1,116 @@
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
+
+from langchain_core.embeddings import Embeddings
+
+
+@dataclass
+class QueryBatchStats:
+    requests: int = 0
+    batches: int = 0
+    batch_sizes: Counter = field(default_factory=Counter)
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+
+class BatchingEmbeddings(Embeddings):
+    """
+    Coalesces concurrent `aembed_query` calls into batched provider requests.
+
+    Queries arriving within `window_ms` of the first pending one (or until
+    `max_batch_size` are waiting) are sent as a single request and each
+    waiter receives its own vector. Providers with asymmetric query and
+    document embeddings (Cohere's `aembed(..., input_type=...)`) are asked
+    for query embeddings; others fall back to `aembed_documents`.
+    Document embedding and sync calls pass straight through.
+
+    Concurrent requests for the same text share one future, whether the
+    first request is still waiting for its window or already in flight.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        *,
+        window_ms: float = 5.0,
+        max_batch_size: int = 32,
+    ) -> None:
+        self.embeddings = embeddings
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self.stats = QueryBatchStats()
+        self._pending: list[str] = []
+        self._futures: dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embeddings.embed_query(text)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        self.stats.requests += 1
+        future = self._futures.get(text)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._futures[text] = loop.create_future()
+            self._pending.append(text)
+
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._flush)
+
+        # Shielded so one cancelled caller does not cancel the shared future
+        return await asyncio.shield(future)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.stats.batches += 1
+        self.stats.batch_sizes[len(batch)] += 1
+        task = asyncio.get_running_loop().create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, texts: list[str]) -> None:
+        futures = [self._futures[text] for text in texts]
+        try:
+            vectors = await self._embed_queries(texts)
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for future, vector in zip(futures, vectors):
+                if not future.done():
+                    future.set_result(vector)
+        finally:
+            for text, future in zip(texts, futures):
+                if self._futures.get(text) is future:
+                    del self._futures[text]
+                # No-op once resolved; releases waiters if we were cancelled
+                future.cancel()
+
+    async def _embed_queries(self, texts: list[str]) -> list[list[float]]:
+        aembed = getattr(self.embeddings, "aembed", None)
+        if aembed is not None:
+            return await aembed(texts, input_type="search_query")
+        return await self.embeddings.aembed_documents(texts)
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+
+DOCUMENT = "document"
+QUERY = "query"
+
+# SQLite caps the number of bound parameters per statement
+_SQLITE_BATCH = 500
+
+
+@dataclass
+class EmbeddingCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SQLiteVectorCache:
+    """Persistent vector tier keyed by (model, kind, sha256(text))."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, kind TEXT NOT NULL, hash TEXT NOT NULL,"
+            " vector BLOB NOT NULL, PRIMARY KEY (model, kind, hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, model: str, kind: str, hashes: list[str]) -> dict:
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), _SQLITE_BATCH):
+                batch = hashes[i : i + _SQLITE_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT hash, vector FROM embeddings"
+                    f" WHERE model = ? AND kind = ? AND hash IN ({placeholders})",
+                    (model, kind, *batch),
+                )
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+        return found
+
+    def put_many(self, model: str, kind: str, items: dict) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, kind, hash, vector)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (model, kind, key, array("f", vector).tobytes())
+                    for key, vector in items.items()
+                ],
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed cache in front of any embeddings provider.
+
+    Vectors are keyed by (model, kind, sha256(text)), where kind separates
+    document and query embeddings since providers such as Cohere embed them
+    differently. `model` should name everything that changes the vectors,
+    including the output dimensions. Lookups go through an in-process LRU
+    tier, then an optional SQLite tier; only the remaining misses reach the
+    wrapped provider. The async methods run SQLite in a worker thread so
+    disk reads and writes never block the event loop.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model: str,
+        *,
+        max_entries: int = 10_000,
+        path: str | None = None,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model = model
+        self.max_entries = max_entries
+        self.stats = EmbeddingCacheStats()
+        self._memory: OrderedDict[tuple[str, str], list[float]] = OrderedDict()
+        self._disk = SQLiteVectorCache(path) if path else None
+
+    # ------------------------------------------------------------------
+    # Embeddings interface
+    # ------------------------------------------------------------------
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = self._lookup(DOCUMENT, texts)
+        if missing:
+            computed = self.embeddings.embed_documents(list(missing.values()))
+            self._fill(DOCUMENT, keys, vectors, dict(zip(missing, computed)))
+        return vectors
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, vectors, missing = await self._alookup(DOCUMENT, texts)
+        if missing:
+            computed = await self.embeddings.aembed_documents(list(missing.values()))
+            await self._afill(DOCUMENT, keys, vectors, dict(zip(missing, computed)))
+        return vectors
+
+    def embed_query(self, text: str) -> list[float]:
+        keys, vectors, missing = self._lookup(QUERY, [text])
+        if missing:
+            computed = self.embeddings.embed_query(text)
+            self._fill(QUERY, keys, vectors, {keys[0]: computed})
+        return vectors[0]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        keys, vectors, missing = await self._alookup(QUERY, [text])
+        if missing:
+            computed = await self.embeddings.aembed_query(text)
+            await self._afill(QUERY, keys, vectors, {keys[0]: computed})
+        return vectors[0]
+
+    def close(self) -> None:
+        if self._disk:
+            self._disk.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _lookup(self, kind: str, texts: list[str]):
+        """
+        Resolve texts against both tiers.
+
+        Returns the per-text keys, a result list with cached vectors filled
+        in (None for misses), and the de-duplicated misses as key -> text.
+        """
+        keys, vectors, pending = self._from_memory(kind, texts)
+        if pending and self._disk:
+            found = self._disk.get_many(self.model, kind, list(pending))
+            self._from_disk(kind, keys, vectors, pending, found)
+        self.stats.misses += sum(1 for vector in vectors if vector is None)
+        return keys, vectors, pending
+
+    async def _alookup(self, kind: str, texts: list[str]):
+        keys, vectors, pending = self._from_memory(kind, texts)
+        if pending and self._disk:
+            found = await asyncio.to_thread(
+                self._disk.get_many, self.model, kind, list(pending)
+            )
+            self._from_disk(kind, keys, vectors, pending, found)
+        self.stats.misses += sum(1 for vector in vectors if vector is None)
+        return keys, vectors, pending
+
+    def _from_memory(self, kind: str, texts: list[str]):
+        keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() for text in texts]
+        vectors: list[list[float] | None] = [None] * len(texts)
+
+        pending: dict[str, str] = {}
+        for i, key in enumerate(keys):
+            vector = self._memory.get((kind, key))
+            if vector is not None:
+                self._memory.move_to_end((kind, key))
+                self.stats.memory_hits += 1
+                vectors[i] = vector
+            else:
+                pending[key] = texts[i]
+        return keys, vectors, pending
+
+    def _from_disk(
+        self, kind: str, keys: list[str], vectors: list, pending: dict, found: dict
+    ) -> None:
+        for key, vector in found.items():
+            self._remember(kind, key, vector)
+            del pending[key]
+        for i, key in enumerate(keys):
+            if vectors[i] is None and key in found:
+                self.stats.disk_hits += 1
+                vectors[i] = found[key]
+
+    def _fill(self, kind: str, keys: list[str], vectors: list, computed: dict) -> None:
+        if self._disk:
+            self._disk.put_many(self.model, kind, computed)
+        self._fill_memory(kind, keys, vectors, computed)
+
+    async def _afill(
+        self, kind: str, keys: list[str], vectors: list, computed: dict
+    ) -> None:
+        if self._disk:
+            await asyncio.to_thread(self._disk.put_many, self.model, kind, computed)
+        self._fill_memory(kind, keys, vectors, computed)
+
+    def _fill_memory(
+        self, kind: str, keys: list[str], vectors: list, computed: dict
+    ) -> None:
+        for key, vector in computed.items():
+            self._remember(kind, key, vector)
+        for i, key in enumerate(keys):
+            if vectors[i] is None:
+                vectors[i] = computed[key]
+
+    def _remember(self, kind: str, key: str, vector: list[float]) -> None:
+        self._memory[(kind, key)] = vector
+        self._memory.move_to_end((kind, key))
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
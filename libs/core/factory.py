@@ -2,21 +2,59 @@ from langchain_core.tools import BaseTool
 
 from langchain.messages import SystemMessage
 from langchain.agents import create_agent
+from langchain.agents.middleware import SummarizationMiddleware
+
+from langchain_core.embeddings import Embeddings
 
 from libs.core.agent import Agent
+from libs.core.budget import RunBudgetMiddleware
+from libs.core.checkpoint import ExpiringInMemorySaver
+from libs.core.embeddings.batching import BatchingEmbeddings
+from libs.core.embeddings.cache import CachedEmbeddings
 from libs.core.http import HttpClient
 from libs.core.stores.base import BaseStore
-from libs.core.registry import LLM_PROVIDERS, STORE_PROVIDERS
-from libs.core.settings import PegasusSettings
+from libs.core.registry import EMBEDDING_PROVIDERS, LLM_PROVIDERS, STORE_PROVIDERS
+from libs.core.settings import EmbeddingSettings, PegasusSettings
 
 
-def create_store(settings: PegasusSettings) -> BaseStore:
+def create_store(
+    settings: PegasusSettings, embeddings: Embeddings | None = None
+) -> BaseStore:
     provider = settings.store.provider
 
     if provider not in STORE_PROVIDERS:
         raise ValueError(f"Unknown store provider: {provider}")
 
-    return STORE_PROVIDERS[provider](settings.store)
+    return STORE_PROVIDERS[provider](settings.store, embeddings=embeddings)
+
+
+def create_embeddings(settings: EmbeddingSettings) -> Embeddings:
+    provider = settings.provider
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(f"Unknown embedding provider: {provider}")
+
+    embeddings = EMBEDDING_PROVIDERS[provider](settings)
+
+    # Batching sits under the cache so only cache misses are coalesced
+    batching = settings.query_batching
+    if batching:
+        embeddings = BatchingEmbeddings(
+            embeddings,
+            window_ms=batching.window_ms,
+            max_batch_size=batching.max_batch_size,
+        )
+
+    cache = settings.cache
+    if cache and cache.enabled:
+        embeddings = CachedEmbeddings(
+            embeddings,
+            # Vectors of different sizes from one model must not share keys
+            model=f"{provider}:{settings.model}:{settings.dimensions}",
+            max_entries=cache.max_entries,
+            path=cache.path,
+        )
+
+    return embeddings
 
 
 def create_llm(settings: PegasusSettings):
@@ -27,17 +65,183 @@ def create_llm(settings: PegasusSettings):
     return LLM_PROVIDERS[provider](settings.agent.llm)
 
 
-def create_agent_graph(settings: PegasusSettings, tools: list[BaseTool]):
+def create_checkpointer(settings: PegasusSettings):
+    conversation = settings.agent.conversation
+    if conversation is None:
+        return None
+
+    if conversation.backend == "memory":
+        return ExpiringInMemorySaver(ttl_seconds=conversation.ttl_seconds)
+
+    if conversation.backend == "mongodb":
+        from langgraph.checkpoint.mongodb import MongoDBSaver
+        from pymongo import MongoClient
+
+        from libs.providers.stores.mongodb import client_options
+
+        mongodb = settings.store.mongodb
+        if mongodb is None:
+            raise ValueError("MongoDB conversation backend requires store.mongodb")
+
+        # Mongo applies the TTL with an index on checkpoint creation time
+        return MongoDBSaver(
+            MongoClient(mongodb.uri, **client_options(mongodb)),
+            db_name=mongodb.database,
+            checkpoint_collection_name=conversation.collection,
+            writes_collection_name=f"{conversation.collection}_writes",
+            ttl=conversation.ttl_seconds,
+        )
+
+    raise ValueError(f"Unknown conversation backend: {conversation.backend}")
+
+
+def create_agent_graph(
+    settings: PegasusSettings, tools: list[BaseTool], model=None, checkpointer=None
+):
+    model = model or create_llm(settings=settings)
+    if checkpointer is None:
+        checkpointer = create_checkpointer(settings)
+
+    middleware = [
+        RunBudgetMiddleware(
+            max_iterations=settings.agent.max_iterations,
+            deadline_seconds=settings.agent.deadline_seconds,
+            token_budget=settings.agent.token_budget,
+        )
+    ]
+    conversation = settings.agent.conversation
+    if conversation:
+        # Older turns are folded into a summary so prompts stay bounded
+        middleware.append(
+            SummarizationMiddleware(
+                model,
+                trigger=("tokens", conversation.summarize_after_tokens),
+                keep=("messages", conversation.keep_messages),
+            )
+        )
+
     return Agent(
         create_agent(
-            model=create_llm(settings=settings),
+            model=model,
             tools=tools,
             system_prompt=SystemMessage(
                 content=[{"type": "text", "text": settings.agent.prompt}]
             ),
+            middleware=middleware,
+            checkpointer=checkpointer,
         )
     )
 
 
 def create_http_client(settings: PegasusSettings):
     return HttpClient(settings=settings.merchant_api)
+
+
+class Resources:
+    """
+    Shared clients for one process, each created on first use.
+
+    Services take the store, HTTP client, embeddings and LLM from here
+    instead of building their own, so a process holds one Mongo pool,
+    one merchant API pool (and OAuth token) and one embeddings client.
+    The store is built on the shared embeddings. The checkout session
+    cache lives here too, so webhooks handled by `OrderService` update
+    the sessions `CheckoutService` polls. Call `startup()` to
+    create the network clients before serving and `shutdown()` to close
+    everything it opened, including the embeddings cache and the
+    conversation checkpointer.
+    """
+
+    def __init__(self, settings: PegasusSettings) -> None:
+        self.settings = settings
+        self._store: BaseStore | None = None
+        self._http: HttpClient | None = None
+        self._embeddings: Embeddings | None = None
+        self._llm = None
+        self._session_cache = None
+        self._checkpointer = None
+
+    @property
+    def store(self) -> BaseStore:
+        if self._store is None:
+            self._store = create_store(self.settings, embeddings=self.embeddings)
+        return self._store
+
+    @property
+    def http(self) -> HttpClient:
+        if self._http is None:
+            self._http = create_http_client(self.settings)
+        return self._http
+
+    @property
+    def embeddings(self) -> Embeddings | None:
+        if self._embeddings is None and self.settings.store.embeddings:
+            self._embeddings = create_embeddings(self.settings.store.embeddings)
+        return self._embeddings
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            self._llm = create_llm(self.settings)
+        return self._llm
+
+    @property
+    def session_cache(self):
+        cache = self.settings.merchant_api.session_cache
+        if self._session_cache is None and cache and cache.enabled:
+            from checkout.cache import CheckoutSessionCache
+
+            self._session_cache = CheckoutSessionCache(
+                max_age_seconds=cache.max_age_seconds, max_entries=cache.max_entries
+            )
+        return self._session_cache
+
+    @property
+    def checkpointer(self):
+        if self._checkpointer is None:
+            self._checkpointer = create_checkpointer(self.settings)
+        return self._checkpointer
+
+    async def startup(self) -> None:
+        # Build the pooled clients up front so no request pays for them
+        _ = self.store, self.http
+        # Bring search indexes in line with the configured filter fields
+        ensure = getattr(self.store, "ensure_search_indexes", None)
+        if ensure is not None:
+            await ensure()
+
+    async def shutdown(self) -> None:
+        if self._http is not None:
+            await self._http.close()
+        close = getattr(self._store, "close", None)
+        if close is not None:
+            await close()
+        close = getattr(self._embeddings, "close", None)
+        if close is not None:
+            close()
+        # MongoDBSaver keeps its (sync) client; the in-memory saver has none
+        client = getattr(self._checkpointer, "client", None)
+        if client is not None:
+            client.close()
+        self._store = self._http = self._embeddings = self._llm = None
+        self._session_cache = self._checkpointer = None
+
+
+_resources: Resources | None = None
+
+
+def get_resources(settings: PegasusSettings) -> Resources:
+    """
+    Return the process-wide `Resources`, creating it on first call.
+
+    Raises ValueError if called again with different settings, which
+    would otherwise be silently ignored.
+    """
+    global _resources
+    if _resources is None:
+        _resources = Resources(settings)
+    elif _resources.settings != settings:
+        raise ValueError(
+            "get_resources() was already called with different settings"
+        )
+    return _resources
@@ -1,12 +1,34 @@
+import asyncio
 from authlib.integrations.httpx_client import AsyncOAuth2Client
 from typing import Optional
 
+import httpx
+
+from libs.core.oauth import get_token_cache
+from libs.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitStats,
+    RetryPolicy,
+)
 from libs.core.settings import MerchantAPISettings
 
+# Per-call timeout: seconds for every phase, an httpx.Timeout, or None for
+# the client's configured timeouts
+Timeout = float | httpx.Timeout | None
+
+# Request headers that can change a GET response; coalesced GETs must match
+# on these (per-request ids and signatures are ignored)
+COALESCE_HEADERS = ("accept", "accept-language", "api-version")
+
 
 class HttpClient:
     """
     Async HTTP client for merchant APIs with OAuth2 client credentials.
+
+    Access tokens come from the shared token cache, so all clients in the
+    process (and on the host, with `oauth.token_cache_path`) reuse one
+    token and only one of them fetches a new one.
     """
 
     def __init__(self, settings: MerchantAPISettings):
@@ -16,23 +38,252 @@ class HttpClient:
             client_secret=settings.oauth.client_secret,
             token_endpoint=settings.oauth.token_url,
             scope=settings.oauth.scope,
+            # Expiry is managed by the shared token cache; authlib's default
+            # 60s leeway would reject tokens the cache still hands out
+            leeway=0,
+            grant_type="client_credentials",
+            timeout=httpx.Timeout(
+                settings.timeout,
+                connect=settings.connect_timeout or settings.timeout,
+                read=settings.read_timeout or settings.timeout,
+                write=settings.write_timeout or settings.timeout,
+                pool=settings.pool_timeout or settings.timeout,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            http2=settings.http2,
         )
         self._base_url = settings.base_url
+        self._token_url = settings.oauth.token_url
+        self._token_key = "|".join(
+            (settings.oauth.token_url, settings.oauth.client_id, settings.oauth.scope)
+        )
+        self._tokens = get_token_cache(
+            settings.oauth.token_cache_path, settings.oauth.refresh_margin_seconds
+        )
+        self._retry = RetryPolicy(
+            max_attempts=settings.retry.max_attempts,
+            base_delay=settings.retry.base_delay,
+            max_delay=settings.retry.max_delay,
+            max_retry_after=settings.retry.max_retry_after,
+        )
+        self._circuit = settings.circuit_breaker
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self.retries = 0
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        # Requests answered by another caller's in-flight GET
+        self.coalesced = 0
 
-    async def get(self, path: str, params: Optional[dict] = None, **kwargs) -> dict:
-        resp = await self._client.get(f"{self._base_url}{path}", params=params, **kwargs)
-        resp.raise_for_status()
+    async def get(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        coalesce: bool = False,
+        **kwargs,
+    ) -> dict:
+        resp = await self._get(path, params, timeout, endpoint, coalesce, **kwargs)
         return resp.json()
 
-    async def post(self, path: str, json: Optional[dict] = None, **kwargs) -> dict:
-        resp = await self._client.post(f"{self._base_url}{path}", json=json, **kwargs)
-        resp.raise_for_status()
+    async def post(
+        self,
+        path: str,
+        json: Optional[dict] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> dict:
+        resp = await self._request(
+            "POST", path, endpoint=endpoint, timeout=timeout, json=json, **kwargs
+        )
         return resp.json()
 
-    async def patch(self, path: str, json: Optional[dict] = None, **kwargs) -> dict:
-        resp = await self._client.patch(f"{self._base_url}{path}", json=json, **kwargs)
-        resp.raise_for_status()
+    async def patch(
+        self,
+        path: str,
+        json: Optional[dict] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> dict:
+        resp = await self._request(
+            "PATCH", path, endpoint=endpoint, timeout=timeout, json=json, **kwargs
+        )
         return resp.json()
 
+    # Raw variants: the body goes out as given and the response body comes
+    # back as bytes, so callers can validate it in one pass with
+    # `Model.model_validate_json` instead of building a dict first.
+
+    async def get_raw(
+        self,
+        path: str,
+        params: Optional[dict] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        coalesce: bool = False,
+        **kwargs,
+    ) -> bytes:
+        resp = await self._get(path, params, timeout, endpoint, coalesce, **kwargs)
+        return resp.content
+
+    async def post_raw(
+        self,
+        path: str,
+        content: Optional[bytes] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> bytes:
+        resp = await self._request(
+            "POST", path, endpoint=endpoint, timeout=timeout, content=content, **kwargs
+        )
+        return resp.content
+
+    async def patch_raw(
+        self,
+        path: str,
+        content: Optional[bytes] = None,
+        timeout: Timeout = None,
+        endpoint: Optional[str] = None,
+        **kwargs,
+    ) -> bytes:
+        resp = await self._request(
+            "PATCH", path, endpoint=endpoint, timeout=timeout, content=content, **kwargs
+        )
+        return resp.content
+
+    def circuit_stats(self) -> dict[str, CircuitStats]:
+        """Circuit breaker state and counters per endpoint."""
+        return {endpoint: breaker.stats for endpoint, breaker in self._breakers.items()}
+
     async def close(self):
         await self._client.aclose()
+
+    async def _get(
+        self,
+        path: str,
+        params: Optional[dict],
+        timeout: Timeout,
+        endpoint: Optional[str],
+        coalesce: bool,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        GET, optionally single-flight: with `coalesce`, callers asking for
+        the same path, params and response-shaping headers while one such
+        request is in flight share its response (or error) instead of
+        sending their own.
+        """
+        def send():
+            return self._request(
+                "GET", path, endpoint=endpoint, timeout=timeout, params=params, **kwargs
+            )
+
+        if not coalesce:
+            return await send()
+
+        headers = {k.lower(): v for k, v in (kwargs.get("headers") or {}).items()}
+        key = (
+            path,
+            repr(sorted((params or {}).items())),
+            tuple((name, headers.get(name)) for name in COALESCE_HEADERS),
+        )
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(send())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shielded so one caller giving up does not cancel it for the others
+        return await asyncio.shield(task)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        *,
+        endpoint: Optional[str],
+        timeout: Timeout,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request through the endpoint's circuit breaker, retrying
+        transient failures. GETs and requests carrying an Idempotency-Key
+        are retried on transport errors and retryable statuses; anything
+        else is only retried on 429, which the server did not process.
+        Retries resend the same headers, so the Idempotency-Key is reused.
+        """
+        endpoint = endpoint or f"{method} {path}"
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = CircuitBreaker(
+                self._circuit.failure_threshold, self._circuit.reset_timeout
+            )
+        headers = kwargs.get("headers") or {}
+        idempotent = method == "GET" or "Idempotency-Key" in headers
+
+        attempt = 0
+        while True:
+            if not breaker.allow():
+                raise CircuitOpenError(endpoint, breaker.retry_in())
+            attempt += 1
+
+            try:
+                await self._ensure_token()
+                resp = await self._client.request(
+                    method,
+                    f"{self._base_url}{path}",
+                    timeout=self._timeout(timeout),
+                    **kwargs,
+                )
+            except httpx.TransportError:
+                breaker.record_failure()
+                delay = self._retry.delay(attempt) if idempotent else None
+                if delay is None:
+                    raise
+            except asyncio.CancelledError:
+                # Nothing was learned about the endpoint; free a half-open probe
+                breaker.release()
+                raise
+            except BaseException:
+                breaker.record_failure()
+                raise
+            else:
+                status = resp.status_code
+                if status == 429 or status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+
+                delay = None
+                if status in self._retry.retry_statuses and (idempotent or status == 429):
+                    delay = self._retry.delay(attempt, resp.headers.get("Retry-After"))
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def _ensure_token(self) -> None:
+        token = await self._tokens.get(self._token_key, self._fetch_token)
+        current = self._client.token
+        if current is None or current["access_token"] != token["access_token"]:
+            self._client.token = token
+
+    async def _fetch_token(self) -> dict:
+        return await self._client.fetch_token(
+            self._token_url, grant_type="client_credentials"
+        )
+
+    @staticmethod
+    def _timeout(timeout: Timeout):
+        # httpx reads timeout=None as "no timeout", so fall back explicitly
+        return httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
@@ -0,0 +1,155 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable
+
+TokenFetcher = Callable[[], Awaitable[dict]]
+
+
+@dataclass
+class TokenCacheStats:
+    memory_hits: int = 0
+    file_hits: int = 0
+    fetches: int = 0
+    background_refreshes: int = 0
+    fetch_seconds_total: float = 0.0
+    fetch_seconds_max: float = 0.0
+
+    @property
+    def mean_fetch_ms(self) -> float:
+        return 1000 * self.fetch_seconds_total / self.fetches if self.fetches else 0.0
+
+
+class SharedTokenCache:
+    """
+    OAuth2 access tokens shared by every client in the process and, when
+    `path` is set, by every process on the host.
+
+    Tokens are refreshed `refresh_margin_seconds` before they expire. A
+    caller that finds the token inside that margin still gets the current
+    token while one background task refreshes it; callers only wait when
+    there is no valid token at all. Refreshes are single-flight: an asyncio
+    lock serializes them within the process, and an exclusive `flock` on a
+    per-key lock file serializes them across processes, so whoever gets the
+    lock second finds the new token in the shared file instead of fetching.
+    """
+
+    def __init__(
+        self, path: str | None = None, refresh_margin_seconds: float = 120.0
+    ) -> None:
+        self.path = Path(path) if path else None
+        self.refresh_margin = refresh_margin_seconds
+        self.stats = TokenCacheStats()
+        self._tokens: dict[str, dict] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, fetch: TokenFetcher) -> dict:
+        token = self._tokens.get(key)
+        now = time.time()
+        if token and token["expires_at"] - self.refresh_margin > now:
+            self.stats.memory_hits += 1
+            return token
+
+        if token and token["expires_at"] > now:
+            # Still usable: serve it and refresh in the background
+            self.stats.memory_hits += 1
+            if key not in self._refreshing:
+                self.stats.background_refreshes += 1
+                task = asyncio.create_task(self._refresh(key, fetch))
+                self._refreshing[key] = task
+                task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+            return token
+
+        return await self._refresh(key, fetch)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _fresh(self, token: dict | None) -> bool:
+        return bool(token) and token["expires_at"] - self.refresh_margin > time.time()
+
+    async def _refresh(self, key: str, fetch: TokenFetcher) -> dict:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller refreshed while this one waited for the lock
+            token = self._tokens.get(key)
+            if self._fresh(token):
+                self.stats.memory_hits += 1
+                return token
+
+            if self.path is None:
+                token = await self._fetch(fetch)
+            else:
+                token = await self._refresh_shared(key, fetch)
+
+            self._tokens[key] = token
+            return token
+
+    async def _refresh_shared(self, key: str, fetch: TokenFetcher) -> dict:
+        self.path.mkdir(parents=True, exist_ok=True)
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        token_file = self.path / f"{name}.json"
+
+        fd = os.open(self.path / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            await asyncio.to_thread(fcntl.flock, fd, fcntl.LOCK_EX)
+
+            token = _read_token(token_file)
+            if self._fresh(token):
+                self.stats.file_hits += 1
+                return token
+
+            token = await self._fetch(fetch)
+            _write_token(token_file, token)
+            return token
+        finally:
+            os.close(fd)  # also releases the lock
+
+    async def _fetch(self, fetch: TokenFetcher) -> dict:
+        started = time.perf_counter()
+        token = dict(await fetch())
+        elapsed = time.perf_counter() - started
+
+        self.stats.fetches += 1
+        self.stats.fetch_seconds_total += elapsed
+        self.stats.fetch_seconds_max = max(self.stats.fetch_seconds_max, elapsed)
+
+        if "expires_at" not in token:
+            token["expires_at"] = time.time() + float(token.get("expires_in", 3600))
+        return token
+
+
+def _read_token(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write_token(path: Path, token: dict) -> None:
+    # Owner-only, and renamed into place so readers never see a partial file
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(token, f)
+    os.replace(tmp, path)
+
+
+_caches: dict[tuple, SharedTokenCache] = {}
+
+
+def get_token_cache(
+    path: str | None = None, refresh_margin_seconds: float = 120.0
+) -> SharedTokenCache:
+    """Return the process-wide cache for `path`, creating it on first call."""
+    key = (path, refresh_margin_seconds)
+    if key not in _caches:
+        _caches[key] = SharedTokenCache(path, refresh_margin_seconds)
+    return _caches[key]
@@ -0,0 +1,132 @@
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Literal
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while an endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float) -> None:
+        super().__init__(
+            f"Circuit open for {endpoint}; next probe in {retry_in:.1f}s"
+        )
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    A `Retry-After` header (seconds or HTTP date) replaces the computed
+    delay; if the server asks for longer than `max_retry_after` the request
+    is not retried at all.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.2,
+        max_delay: float = 5.0,
+        max_retry_after: float = 30.0,
+        retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504}),
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = retry_statuses
+
+    def delay(self, attempt: int, retry_after: str | None = None) -> float | None:
+        """Seconds to wait before retry number `attempt` (1-based), or None to stop."""
+        if attempt >= self.max_attempts:
+            return None
+        if retry_after is not None:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return seconds if seconds <= self.max_retry_after else None
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+def parse_retry_after(value: str) -> float | None:
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CircuitStats:
+    state: CircuitState = "closed"
+    consecutive_failures: int = 0
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0
+    opened: int = 0
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are rejected locally for `reset_timeout` seconds. Then it is
+    half-open: a single probe request is let through, and its outcome
+    closes the circuit again or re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = CircuitStats()
+        self._opened_at = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        return self.stats.state
+
+    def retry_in(self) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.stats.state == "open" and self.retry_in() == 0:
+            self.stats.state = "half_open"
+        if self.stats.state == "closed":
+            return True
+        if self.stats.state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.stats.rejected += 1
+        return False
+
+    def release(self) -> None:
+        """Give up an allowed request without an outcome (e.g. cancelled)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.stats.successes += 1
+        self.stats.consecutive_failures = 0
+        self.stats.state = "closed"
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.stats.failures += 1
+        self.stats.consecutive_failures += 1
+        if (
+            self.stats.state == "half_open"
+            or self.stats.consecutive_failures >= self.failure_threshold
+        ):
+            if self.stats.state != "open":
+                self.stats.opened += 1
+            self.stats.state = "open"
+            self._opened_at = time.monotonic()
+        self._probing = False
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 
 
 class MongoDBSettings(BaseModel):
@@ -8,18 +8,64 @@ class MongoDBSettings(BaseModel):
     collection: str
     vector_index: str | None = None
     search_index: str | None = None
+    filter_fields: list[str] = [
+        "availability",
+        "enable_search",
+        "product_category",
+        "brand",
+    ]
+    max_pool_size: int = 100
+    min_pool_size: int = 0
+    max_idle_time_ms: int | None = None
+    connect_timeout_ms: int = 20000
+    socket_timeout_ms: int | None = None
+    server_selection_timeout_ms: int = 30000
+    wait_queue_timeout_ms: int | None = None
+
+
+class MemoryStoreSettings(BaseModel):
+    index: Literal["flat", "ivf"] = "flat"
+    nlist: int = 64
+    nprobe: int = 8
+    snapshot_path: Optional[str] = None
+
+
+class EmbeddingCacheSettings(BaseModel):
+    enabled: bool = True
+    max_entries: int = 10000
+    path: Optional[str] = None
+
+
+class QueryBatchingSettings(BaseModel):
+    window_ms: float = 5.0
+    max_batch_size: int = 32
 
 
 class EmbeddingSettings(BaseModel):
     provider: str
     model: Optional[str] = None
     api_key: Optional[str] = None
+    dimensions: Optional[int] = None
+    quantization: Literal["none", "int8", "binary"] = "none"
+    rescore_factor: int = 4
+    batch_size: int = 96
+    max_concurrency: int = 4
+    cache: Optional[EmbeddingCacheSettings] = None
+    query_batching: Optional[QueryBatchingSettings] = None
+
+
+class ResultCacheSettings(BaseModel):
+    enabled: bool = True
+    ttl_seconds: float = 300
+    max_entries: int = 1024
 
 
 class StoreSettings(BaseModel):
     provider: str
     mongodb: Optional[MongoDBSettings] = None
+    memory: Optional[MemoryStoreSettings] = None
     embeddings: Optional[EmbeddingSettings] = None
+    result_cache: Optional[ResultCacheSettings] = None
 
 
 class LLMSettings(BaseModel):
@@ -27,10 +73,57 @@ class LLMSettings(BaseModel):
     api_key: Optional[str] = None
 
 
+class ToolOutputSettings(BaseModel):
+    """Shapes the compact product view that tools hand back to the model."""
+
+    card_fields: list[str] = [
+        "id",
+        "title",
+        "brand",
+        "product_category",
+        "description",
+        "material",
+        "condition",
+        "product_review_rating",
+        "product_review_count",
+        "return_window",
+    ]
+    variant_fields: list[str] = [
+        "sku",
+        "color",
+        "size",
+        "price",
+        "sale_price",
+        "availability",
+        "inventory_quantity",
+    ]
+    max_text_length: int = 280
+
+
+class ConversationSettings(BaseModel):
+    backend: Literal["memory", "mongodb"] = "memory"
+    ttl_seconds: int = 3600
+    summarize_after_tokens: int = 4000
+    keep_messages: int = 20
+    collection: str = "conversations"
+
+
+class ResponseCacheSettings(BaseModel):
+    enabled: bool = True
+    similarity_threshold: float = 0.95
+    ttl_seconds: int = 900
+    max_entries: int = 2000
+
+
 class AgentSettings(BaseModel):
     llm: LLMSettings
     prompt: str
     max_iterations: int = 5
+    deadline_seconds: Optional[float] = None
+    token_budget: Optional[int] = None
+    tool_output: ToolOutputSettings = ToolOutputSettings()
+    conversation: Optional[ConversationSettings] = None
+    response_cache: Optional[ResponseCacheSettings] = None
 
 
 class OAuthSettings(BaseModel):
@@ -38,11 +131,44 @@ class OAuthSettings(BaseModel):
     client_secret: str
     token_url: str
     scope: str
+    # Directory for the host-wide token cache; None keeps it in-process
+    token_cache_path: Optional[str] = None
+    refresh_margin_seconds: int = 120
+
+
+class RetrySettings(BaseModel):
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    max_retry_after: float = 30.0
+
+
+class CircuitBreakerSettings(BaseModel):
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class SessionCacheSettings(BaseModel):
+    enabled: bool = True
+    max_age_seconds: float = 10.0
+    max_entries: int = 10000
 
 
 class MerchantAPISettings(BaseModel):
     base_url: str
-    timeout: Optional[int] = 10
+    # Default for every phase; the per-phase values below override it
+    timeout: Optional[float] = 10
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    pool_timeout: Optional[float] = None
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 5.0
+    http2: bool = False
+    retry: RetrySettings = RetrySettings()
+    circuit_breaker: CircuitBreakerSettings = CircuitBreakerSettings()
+    session_cache: Optional[SessionCacheSettings] = None
     oauth: OAuthSettings
 
 
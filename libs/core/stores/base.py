@@ -1,11 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from typing import AsyncIterator, Iterable
 from langchain_core.documents import Document
 
 
 class BaseStore(ABC):
     """Base interface for all stores."""
 
+    # Bumped by every write, so caches derived from search results can
+    # tell that the catalog changed underneath them
+    generation: int = 0
+
     @abstractmethod
     async def get(self, key: str) -> dict | None:
         pass
@@ -18,10 +22,36 @@ class BaseStore(ABC):
     async def delete(self, key: str) -> None:
         pass
 
+    @abstractmethod
+    async def delete_many(self, keys: list[str]) -> None:
+        pass
+
     @abstractmethod
     async def query(
-        self, filters: dict, limit: int = 20, offset: int = 0
+        self,
+        filters: dict,
+        limit: int = 20,
+        offset: int = 0,
+        after: str | None = None,
+        projection: list[str] | None = None,
     ) -> Iterable[dict]:
+        """
+        Return up to `limit` records ordered by `_id`.
+
+        Pass the last `_id` of the previous page as `after` to page by key
+        instead of `offset`, which keeps deep pages as cheap as the first.
+        `projection` limits the returned fields (`_id` is always included).
+        """
+        pass
+
+    @abstractmethod
+    def iter_query(
+        self,
+        filters: dict | None = None,
+        batch_size: int = 500,
+        projection: list[str] | None = None,
+    ) -> AsyncIterator[dict]:
+        """Stream every matching record in `_id` order, `batch_size` at a time."""
         pass
 
     @abstractmethod
@@ -31,9 +61,39 @@ class BaseStore(ABC):
         pass
 
     @abstractmethod
-    async def similarity_search(self, query: str, k: int = 5) -> Iterable[dict]:
+    async def upsert_texts(
+        self, ids: list[str], texts: list[str], metadatas: list[dict]
+    ) -> None:
+        """Embed and upsert many texts, batching embedding calls and writes."""
+        pass
+
+    @abstractmethod
+    async def update_metadata(self, updates: dict[str, dict]) -> None:
+        """Overwrite metadata fields by key without touching text or vectors."""
+        pass
+
+    @abstractmethod
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ) -> Iterable[Document]:
+        """
+        `filters` maps metadata fields to a value or a list of accepted
+        values and is applied before ranking, so up to k matching documents
+        come back. `projection` limits the metadata fields returned.
+        """
         pass
 
     @abstractmethod
-    async def hybrid_search(self, query: str) -> Iterable[dict]:
+    async def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ) -> Iterable[Document]:
+        """Same `filters` / `projection` semantics as `similarity_search`."""
         pass
@@ -0,0 +1,90 @@
+import json
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold, NFKC-normalize and collapse whitespace in a search query."""
+    query = unicodedata.normalize("NFKC", query).casefold()
+    return _WHITESPACE.sub(" ", query).strip(" \t\n?!.,;:")
+
+
+class SearchResultCache:
+    """
+    TTL + max-size cache for store search results.
+
+    Entries are keyed on the search kind, the normalized query, k and the
+    filters. Any write to the store calls `invalidate()`, which drops every
+    entry and bumps a generation counter so that searches already in flight
+    when the write happened do not repopulate the cache with stale results.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 1024) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = ResultCacheStats()
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, tuple[float, list]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, kind: str, query: str, k: int, **options: Any) -> Hashable:
+        return (
+            kind,
+            normalize_query(query),
+            k,
+            json.dumps(options, sort_keys=True, default=str),
+        )
+
+    def get(self, key: Hashable) -> list | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, results = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return list(results)
+
+    def set(self, key: Hashable, results: list, generation: int) -> None:
+        """Store results computed while the cache was at `generation`."""
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, list(results))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+        self.stats.invalidations += 1
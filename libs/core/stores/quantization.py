@@ -0,0 +1,145 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+# Rows scored per block so int8 codes are never upcast all at once
+_BLOCK = 4096
+
+
+class Int8Quantizer:
+    """Symmetric per-vector int8 codes: 1 byte per dimension + a float32 scale."""
+
+    name = "int8"
+
+    def allocate(self, rows: int, dimensions: int):
+        return (
+            np.zeros((rows, dimensions), dtype=np.int8),
+            np.ones(rows, dtype=np.float32),
+        )
+
+    def encode(self, vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        scales = np.abs(vectors).max(axis=1) / 127
+        scales[scales == 0] = 1
+        codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return codes, scales.astype(np.float32)
+
+    def scores(self, codes: np.ndarray, scales: np.ndarray, query: np.ndarray):
+        query = np.asarray(query, dtype=np.float32)
+        out = np.empty(len(codes), dtype=np.float32)
+        for start in range(0, len(codes), _BLOCK):
+            block = codes[start : start + _BLOCK].astype(np.float32)
+            out[start : start + _BLOCK] = block @ query
+        return out * scales
+
+    def bytes_per_vector(self, dimensions: int) -> int:
+        return dimensions + 4
+
+
+class BinaryQuantizer:
+    """Sign bits packed 8 per byte, scored by Hamming distance."""
+
+    name = "binary"
+
+    def allocate(self, rows: int, dimensions: int):
+        return np.zeros((rows, (dimensions + 7) // 8), dtype=np.uint8), None
+
+    def encode(self, vectors: np.ndarray) -> tuple[np.ndarray, None]:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        return np.packbits(vectors > 0, axis=1), None
+
+    def scores(self, codes: np.ndarray, scales, query: np.ndarray):
+        packed = np.packbits(np.asarray(query) > 0)
+        hamming = np.bitwise_count(np.bitwise_xor(codes, packed)).sum(
+            axis=1, dtype=np.int32
+        )
+        return -hamming.astype(np.float32)
+
+    def bytes_per_vector(self, dimensions: int) -> int:
+        return (dimensions + 7) // 8
+
+
+QUANTIZERS = {"int8": Int8Quantizer, "binary": BinaryQuantizer}
+
+
+def create_quantizer(mode: str):
+    if mode == "none":
+        return None
+    if mode not in QUANTIZERS:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    return QUANTIZERS[mode]()
+
+
+def rescore(
+    candidates: np.ndarray, vectors: np.ndarray, query: np.ndarray, k: int
+) -> list[tuple[int, float]]:
+    """Exact dot-product ranking of candidate rows, best first."""
+    scores = vectors[candidates] @ np.asarray(query, dtype=np.float32)
+    if len(candidates) > k:
+        top = np.argpartition(scores, -k)[-k:]
+        candidates, scores = candidates[top], scores[top]
+    order = np.argsort(scores)[::-1]
+    return [(int(candidates[i]), float(scores[i])) for i in order]
+
+
+@dataclass
+class QuantizationReportRow:
+    mode: str
+    bytes_per_vector: int
+    index_bytes: int
+    recall: float
+    recall_rescored: float
+
+
+def quantization_report(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    rescore_factor: int = 4,
+) -> list[QuantizationReportRow]:
+    """
+    Measure recall@k against exact float32 search for each mode.
+
+    `recall` ranks by the compact codes alone; `recall_rescored` rescores
+    the top `k * rescore_factor` code hits with the float32 vectors, which
+    is what the stores do at query time.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True).clip(1e-12)
+    queries = np.asarray(queries, dtype=np.float32)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True).clip(1e-12)
+
+    n, dimensions = vectors.shape
+    k = min(k, n)
+    exact = [set(np.argpartition(vectors @ q, -k)[-k:]) for q in queries]
+
+    rows = [
+        QuantizationReportRow(
+            mode="none",
+            bytes_per_vector=4 * dimensions,
+            index_bytes=4 * dimensions * n,
+            recall=1.0,
+            recall_rescored=1.0,
+        )
+    ]
+    for mode in QUANTIZERS:
+        quantizer = create_quantizer(mode)
+        codes, scales = quantizer.encode(vectors)
+        hits = rescored = 0
+        for query, truth in zip(queries, exact):
+            approx = quantizer.scores(codes, scales, query)
+            shortlist = min(n, k * rescore_factor)
+            candidates = np.argpartition(approx, -shortlist)[-shortlist:]
+            hits += len(truth & set(candidates[np.argsort(approx[candidates])][-k:]))
+            rescored += len(truth & {row for row, _ in rescore(candidates, vectors, query, k)})
+        total = k * len(queries)
+        rows.append(
+            QuantizationReportRow(
+                mode=mode,
+                bytes_per_vector=quantizer.bytes_per_vector(dimensions),
+                index_bytes=codes.nbytes + (0 if scales is None else scales.nbytes),
+                recall=hits / total,
+                recall_rescored=rescored / total,
+            )
+        )
+    return rows
@@ -0,0 +1,102 @@
+import re
+import zlib
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from libs.core.registry import register_embedding
+from libs.core.settings import EmbeddingSettings
+
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbeddings(Embeddings):
+    """
+    Fully local, CPU-only embeddings with no model download.
+
+    Each text is mapped to word unigrams/bigrams and character n-grams,
+    which are hashed (crc32, stable across processes) into `dimensions`
+    signed buckets with sublinear term weighting. The vectors are
+    L2-normalized, so cosine similarity approximates TF-IDF overlap.
+    Batches are encoded with a single sparse scatter into a NumPy matrix.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 512,
+        char_ngrams: tuple[int, int] = (3, 5),
+        word_ngrams: int = 2,
+    ) -> None:
+        self.dimensions = dimensions
+        self.char_ngrams = char_ngrams
+        self.word_ngrams = word_ngrams
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        rows, buckets, signs = [], [], []
+        for row, text in enumerate(texts):
+            hashed, sign = self._hash(self._features(text))
+            rows.append(np.full(len(hashed), row, dtype=np.int64))
+            buckets.append(hashed)
+            signs.append(sign)
+
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        if rows:
+            np.add.at(
+                matrix,
+                (np.concatenate(rows), np.concatenate(buckets)),
+                np.concatenate(signs),
+            )
+
+        # Sublinear tf, then L2 normalization
+        matrix = np.sign(matrix) * np.log1p(np.abs(matrix))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
+
+    # ------------------------------------------------------------------
+    # Embeddings interface
+    # ------------------------------------------------------------------
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.encode(texts).tolist()
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.encode([text])[0].tolist()
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _features(self, text: str) -> list[str]:
+        words = _TOKEN.findall(text.casefold())
+        features = list(words)
+        for n in range(2, self.word_ngrams + 1):
+            features += [" ".join(words[i : i + n]) for i in range(len(words) - n + 1)]
+
+        low, high = self.char_ngrams
+        for word in words:
+            padded = f"<{word}>"
+            for n in range(low, high + 1):
+                features += [f"#{padded[i : i + n]}" for i in range(len(padded) - n + 1)]
+        return features
+
+    def _hash(self, features: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in features),
+            dtype=np.uint32,
+            count=len(features),
+        )
+        buckets = (hashes % self.dimensions).astype(np.int64)
+        # The top bit picks the sign so collisions tend to cancel out
+        signs = np.where(hashes >> 31, -1.0, 1.0).astype(np.float32)
+        return buckets, signs
+
+
+@register_embedding("hashing")
+def create_hashing_embeddings(settings: EmbeddingSettings):
+    return HashingEmbeddings(dimensions=settings.dimensions or 512)
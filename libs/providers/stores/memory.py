@@ -0,0 +1,635 @@
+import bisect
+import heapq
+import json
+import math
+import re
+import tempfile
+from collections import Counter, defaultdict
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from libs.core.factory import create_embeddings
+from libs.core.registry import register_store
+from libs.core.settings import MemoryStoreSettings, StoreSettings
+from libs.core.stores.base import BaseStore
+from libs.core.stores.quantization import create_quantizer, rescore
+
+_TOKEN = re.compile(r"\w+")
+
+VECTORS_FILE = "vectors.npy"
+CODES_FILE = "codes.npy"
+SCALES_FILE = "scales.npy"
+RECORDS_FILE = "records.json"
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.casefold())
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of row -> term frequencies."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[int, int]] = defaultdict(dict)
+        self._terms: dict[int, tuple[str, ...]] = {}
+        self._lengths: dict[int, int] = {}
+        self._total_length = 0
+
+    def add(self, row: int, text: str) -> None:
+        self.remove(row)
+        tokens = tokenize(text)
+        counts = Counter(tokens)
+        for term, tf in counts.items():
+            self._postings[term][row] = tf
+        self._terms[row] = tuple(counts)
+        self._lengths[row] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, row: int) -> None:
+        terms = self._terms.pop(row, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(row, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(row)
+
+    def search(self, query: str, k: int, allowed=None) -> list[tuple[int, float]]:
+        n = len(self._lengths)
+        if not n:
+            return []
+        avg_length = self._total_length / n or 1.0
+
+        scores: dict[int, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for row, tf in postings.items():
+                if allowed is not None and not allowed[row]:
+                    continue
+                norm = 1 - self.b + self.b * self._lengths[row] / avg_length
+                scores[row] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        return heapq.nlargest(k, scores.items(), key=itemgetter(1))
+
+
+class FieldIndex:
+    """
+    Metadata columns for filtering: each filtered field keeps an int32
+    array of per-row value codes, so a filter mask is one table lookup
+    per field instead of a Python pass over every record. A column is built
+    the first time its field is filtered on and kept current afterwards.
+    """
+
+    MISSING = -1  # deleted rows and values that cannot be indexed
+
+    def __init__(self) -> None:
+        self._columns: dict[str, np.ndarray] = {}
+        self._codes: dict[str, dict] = {}
+
+    def set(self, row: int, metadata: dict) -> None:
+        for field in self._columns:
+            self._assign(field, row, metadata.get(field))
+
+    def remove(self, row: int) -> None:
+        for column in self._columns.values():
+            if row < len(column):
+                column[row] = self.MISSING
+
+    def mask(self, filters: dict, records: list[dict | None]) -> np.ndarray:
+        size = len(records)
+        mask = np.ones(size, dtype=bool)
+        for field, value in filters.items():
+            if field not in self._columns:
+                self._build(field, records)
+            codes = self._codes[field]
+            accepted = [
+                codes[v]
+                for v in (value if isinstance(value, list) else [value])
+                if _hashable(v) and v in codes
+            ]
+            if not accepted:
+                return np.zeros(size, dtype=bool)
+            # Lookup table by code; the spare last slot catches MISSING (-1)
+            table = np.zeros(len(codes) + 1, dtype=bool)
+            table[accepted] = True
+            mask &= table[self._columns[field][:size]]
+        return mask
+
+    def _build(self, field: str, records: list[dict | None]) -> None:
+        self._columns[field] = np.full(max(len(records), 64), self.MISSING, np.int32)
+        self._codes[field] = {}
+        for row, record in enumerate(records):
+            if record is not None:
+                self._assign(field, row, record["metadata"].get(field))
+
+    def _assign(self, field: str, row: int, value) -> None:
+        column = self._columns[field]
+        if row >= len(column):
+            grown = np.full(max(row + 1, 2 * len(column)), self.MISSING, np.int32)
+            grown[: len(column)] = column
+            column = self._columns[field] = grown
+        if _hashable(value):
+            codes = self._codes[field]
+            column[row] = codes.setdefault(value, len(codes))
+        else:
+            column[row] = self.MISSING
+
+
+def _hashable(value) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class VectorIndex:
+    """
+    Row-addressed matrix of L2-normalized float32 vectors.
+
+    `flat` scores every live row with one matrix-vector product. `ivf`
+    clusters rows with spherical k-means into `nlist` lists and only scans
+    the `nprobe` lists closest to the query; it falls back to a flat scan
+    until there are enough rows to train on.
+
+    With `quantization` set to `int8` or `binary`, candidates are ranked on
+    compact codes first and only the top `k * rescore_factor` are rescored
+    against the float32 rows. The float32 matrix then lives in a
+    memory-mapped temporary file rather than on the heap: resident memory
+    is the codes plus whichever rows the page cache keeps hot, at the cost
+    of a page fault per cold rescored row and disk-speed IVF training.
+    """
+
+    def __init__(
+        self,
+        mode: str = "flat",
+        nlist: int = 64,
+        nprobe: int = 8,
+        quantization: str = "none",
+        rescore_factor: int = 4,
+    ) -> None:
+        if mode not in ("flat", "ivf"):
+            raise ValueError(f"Unknown vector index mode: {mode}")
+        self.mode = mode
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.quantizer = create_quantizer(quantization)
+        self.codes: np.ndarray | None = None
+        self.scales: np.ndarray | None = None
+        self.size = 0
+        self.count = 0
+        self.vectors: np.ndarray | None = None
+        self.live = np.zeros(0, dtype=bool)
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.zeros(0, dtype=np.int32)
+        self._trained_on = 0
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    def set(self, row: int, vector) -> None:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector = vector / norm
+
+        self._ensure_capacity(row + 1, vector.shape[0])
+        self.vectors[row] = vector
+        if self.quantizer is not None:
+            codes, scales = self.quantizer.encode(vector)
+            self.codes[row] = codes[0]
+            if scales is not None:
+                self.scales[row] = scales[0]
+        if not self.live[row]:
+            self.live[row] = True
+            self.count += 1
+        self.size = max(self.size, row + 1)
+
+        if self.centroids is not None:
+            self.assignments[row] = int(np.argmax(self.centroids @ vector))
+        self.train_if_needed()
+
+    def remove(self, row: int) -> None:
+        if self.live[row]:
+            self.live[row] = False
+            self.count -= 1
+
+    def search(self, query, k: int, allowed=None) -> list[tuple[int, float]]:
+        if not self.size:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        mask = self.live[: self.size].copy()
+        if allowed is not None:
+            mask &= allowed[: self.size]
+        if self.mode == "ivf" and self.centroids is not None:
+            probes = np.argsort(self.centroids @ query)[-self.nprobe :]
+            mask &= np.isin(self.assignments[: self.size], probes)
+
+        rows = np.flatnonzero(mask)
+        if not len(rows):
+            return []
+        if self.quantizer is not None and len(rows) > k:
+            rows = self._shortlist(rows, query, k * self.rescore_factor)
+        return rescore(rows, self.vectors, query, k)
+
+    def load(
+        self,
+        vectors: np.ndarray,
+        codes: np.ndarray | None = None,
+        scales: np.ndarray | None = None,
+    ) -> None:
+        """Adopt (possibly memory-mapped) snapshot arrays as live rows."""
+        size = len(vectors)
+        self.vectors = vectors
+        self.size = self.count = size
+        self.live = np.ones(size, dtype=bool)
+        self.assignments = np.full(size, -1, dtype=np.int32)
+        if self.quantizer is not None:
+            if codes is None:
+                codes, scales = self.quantizer.encode(vectors)
+            self.codes, self.scales = codes, scales
+        self.train_if_needed()
+
+    def train(self, iterations: int = 10) -> None:
+        rows = np.flatnonzero(self.live[: self.size])
+        data = self.vectors[rows]
+        nlist = min(self.nlist, len(rows))
+        rng = np.random.default_rng(0)
+        centroids = data[rng.choice(len(rows), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = data[assign == c]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[c] = mean / (np.linalg.norm(mean) or 1.0)
+
+        self.centroids = centroids
+        self.assignments[rows] = np.argmax(data @ centroids.T, axis=1)
+        self._trained_on = len(rows)
+
+    def train_if_needed(self) -> None:
+        """(Re)train once there are 8 rows per list, then whenever size doubles."""
+        if self.mode != "ivf" or self.count < self.nlist * 8:
+            return
+        if self.centroids is None or self.count >= 2 * self._trained_on:
+            self.train()
+
+    def _shortlist(self, rows: np.ndarray, query: np.ndarray, n: int) -> np.ndarray:
+        """Best `n` rows by compact-code score."""
+        if len(rows) == self.size:
+            codes = self.codes[: self.size]
+            scales = None if self.scales is None else self.scales[: self.size]
+        else:
+            codes = self.codes[rows]
+            scales = None if self.scales is None else self.scales[rows]
+        approx = self.quantizer.scores(codes, scales, query)
+        if len(rows) <= n:
+            return rows
+        return rows[np.argpartition(approx, -n)[-n:]]
+
+    def _allocate_vectors(self, capacity: int, dim: int) -> np.ndarray:
+        if self.quantizer is None:
+            return np.zeros((capacity, dim), dtype=np.float32)
+        # Zero-filled and unlinked on close; only rescoring reads it
+        return np.memmap(
+            tempfile.TemporaryFile(),
+            dtype=np.float32,
+            mode="w+",
+            shape=(capacity, dim),
+        )
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        if rows <= self.capacity:
+            return
+        capacity = max(rows, 2 * self.capacity, 64)
+        vectors = self._allocate_vectors(capacity, dim)
+        live = np.zeros(capacity, dtype=bool)
+        assignments = np.full(capacity, -1, dtype=np.int32)
+        if self.vectors is not None:
+            vectors[: self.size] = self.vectors[: self.size]
+            live[: self.size] = self.live[: self.size]
+            assignments[: self.size] = self.assignments[: self.size]
+        self.vectors, self.live, self.assignments = vectors, live, assignments
+
+        if self.quantizer is not None:
+            codes, scales = self.quantizer.allocate(capacity, dim)
+            if self.codes is not None:
+                codes[: self.size] = self.codes[: self.size]
+                if scales is not None:
+                    scales[: self.size] = self.scales[: self.size]
+            self.codes, self.scales = codes, scales
+
+
+class MemoryStore(BaseStore):
+    """
+    In-process store backed by a NumPy vector matrix and a BM25 index.
+
+    Intended for small catalogs where sub-millisecond search matters and
+    as a network-free stand-in for tests and benchmarks. State can be
+    written with `snapshot()` and reopened with `load()`, which maps the
+    vector matrix from disk instead of reading it into memory.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings | None = None,
+        index: str = "flat",
+        nlist: int = 64,
+        nprobe: int = 8,
+        rrf_penalty: int = 60,
+        quantization: str = "none",
+        rescore_factor: int = 4,
+    ):
+        self.embeddings = embeddings
+        self.rrf_penalty = rrf_penalty
+        self._vectors = VectorIndex(
+            mode=index,
+            nlist=nlist,
+            nprobe=nprobe,
+            quantization=quantization,
+            rescore_factor=rescore_factor,
+        )
+        self._keywords = BM25Index()
+        self._fields = FieldIndex()
+        self._ids: list[str | None] = []
+        self._rows: dict[str, int] = {}
+        self._records: list[dict | None] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # ------------------------------------------------------------------
+    # Key/value access
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str):
+        row = self._rows.get(key)
+        return None if row is None else self._to_record(row)
+
+    async def put(self, document: Document):
+        self._require_embeddings("put")
+        id = document.id or uuid4().hex
+        await self.upsert_texts([id], [document.page_content], [document.metadata])
+
+    async def delete(self, key: str):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._records[row] = None
+        self._vectors.remove(row)
+        self._keywords.remove(row)
+        self._fields.remove(row)
+        self.generation += 1
+
+    async def delete_many(self, keys: list[str]):
+        for key in keys:
+            await self.delete(key)
+
+    async def query(
+        self, filters: dict, limit=20, offset=0, after=None, projection=None
+    ):
+        records = self._scan(filters, after, projection)
+        return list(islice(records, offset, offset + limit))
+
+    async def iter_query(
+        self,
+        filters: dict | None = None,
+        batch_size: int = 500,
+        projection: list[str] | None = None,
+    ):
+        for record in self._scan(filters, projection=projection):
+            yield record
+
+    async def upsert_text(self, id: str, text: str, metadata: dict | None = None):
+        await self.upsert_texts([id], [text], [metadata or {}])
+
+    async def upsert_texts(
+        self, ids: list[str], texts: list[str], metadatas: list[dict]
+    ):
+        self._require_embeddings("upsert_texts")
+        if not ids:
+            return
+        vectors = await self.embeddings.aembed_documents(texts)
+        for id, text, metadata, vector in zip(ids, texts, metadatas, vectors):
+            self._write(id, text, metadata, vector)
+
+    async def update_metadata(self, updates: dict[str, dict]):
+        for id, metadata in updates.items():
+            row = self._rows.get(id)
+            if row is not None:
+                self._records[row]["metadata"].update(metadata)
+                self._fields.set(row, self._records[row]["metadata"])
+                self.generation += 1
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ):
+        self._require_embeddings("Similarity search")
+        query_vector = await self.embeddings.aembed_query(query)
+        allowed = self._allowed(filters)
+        return [
+            self._to_document(row, projection)
+            for row, _ in self._vectors.search(query_vector, k, allowed)
+        ]
+
+    async def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ):
+        self._require_embeddings("Hybrid search")
+        query_vector = await self.embeddings.aembed_query(query)
+        allowed = self._allowed(filters)
+
+        scores: dict[int, float] = defaultdict(float)
+        for hits in (
+            self._vectors.search(query_vector, k, allowed),
+            self._keywords.search(query, k, allowed),
+        ):
+            for rank, (row, _) in enumerate(hits):
+                scores[row] += 1.0 / (rank + self.rrf_penalty + 1)
+
+        ranked = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+        return [self._to_document(row, projection) for row, _ in ranked]
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def snapshot(self, path: str) -> None:
+        """
+        Write live rows to `path`: vectors.npy, records.json and, when
+        quantized, the compact codes.npy / scales.npy.
+        """
+        directory = Path(path)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        index = self._vectors
+        rows = sorted(self._rows.values())
+        if rows:
+            np.save(directory / VECTORS_FILE, index.vectors[rows])
+            if index.codes is not None:
+                np.save(directory / CODES_FILE, index.codes[rows])
+            if index.scales is not None:
+                np.save(directory / SCALES_FILE, index.scales[rows])
+        records = [{"_id": self._ids[row], **self._records[row]} for row in rows]
+        (directory / RECORDS_FILE).write_text(json.dumps(records, default=str))
+
+    def load(self, path: str) -> None:
+        """
+        Replace the store contents with a snapshot.
+
+        The vector matrix is memory-mapped copy-on-write, so loading is
+        O(1) in the catalog size and pages are read on first access.
+        """
+        directory = Path(path)
+        records = json.loads((directory / RECORDS_FILE).read_text())
+
+        index = self._vectors
+        self._vectors = VectorIndex(
+            index.mode,
+            index.nlist,
+            index.nprobe,
+            quantization=index.quantization,
+            rescore_factor=index.rescore_factor,
+        )
+        self._keywords = BM25Index()
+        self._fields = FieldIndex()
+        self._ids, self._rows, self._records = [], {}, []
+        self.generation += 1
+        if not records:
+            return
+
+        for row, record in enumerate(records):
+            id = record.pop("_id")
+            self._ids.append(id)
+            self._rows[id] = row
+            self._records.append(record)
+            self._keywords.add(row, record["text"])
+
+        def mapped(name: str):
+            file = directory / name
+            return np.load(file, mmap_mode="c") if file.exists() else None
+
+        codes = mapped(CODES_FILE) if index.quantization != "none" else None
+        self._vectors.load(
+            mapped(VECTORS_FILE),
+            codes=codes,
+            scales=mapped(SCALES_FILE) if codes is not None else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _require_embeddings(self, operation: str):
+        if not self.embeddings:
+            raise RuntimeError(f"{operation} requires an embeddings provider")
+
+    def _write(self, id: str, text: str, metadata: dict, vector) -> None:
+        row = self._rows.get(id)
+        if row is None:
+            row = len(self._ids)
+            self._ids.append(id)
+            self._records.append(None)
+            self._rows[id] = row
+        self._records[row] = {"text": text, "metadata": dict(metadata)}
+        self._vectors.set(row, vector)
+        self._keywords.add(row, text)
+        self._fields.set(row, metadata)
+        self.generation += 1
+
+    def _scan(
+        self,
+        filters: dict | None,
+        after: str | None = None,
+        projection: list[str] | None = None,
+    ):
+        """Yield matching records in `_id` order, starting after `after`."""
+        keys = sorted(self._rows)
+        start = 0 if after is None else bisect.bisect_right(keys, after)
+        for key in keys[start:]:
+            row = self._rows.get(key)
+            if row is not None and self._matches(self._records[row]["metadata"], filters):
+                yield self._to_record(row, projection)
+
+    def _matches(self, metadata: dict, filters: dict | None) -> bool:
+        return all(metadata.get(key) == value for key, value in (filters or {}).items())
+
+    def _allowed(self, filters: dict | None) -> np.ndarray | None:
+        """Boolean row mask for search filters (`{field: value | [values]}`)."""
+        if not filters:
+            return None
+        return self._fields.mask(filters, self._records)
+
+    def _project(self, metadata: dict, projection: list[str] | None) -> dict:
+        if projection is None:
+            return dict(metadata)
+        return {field: metadata[field] for field in projection if field in metadata}
+
+    def _to_record(self, row: int, projection: list[str] | None = None) -> dict:
+        record = self._records[row]
+        fields = {"text": record["text"], **record["metadata"]}
+        return {"_id": self._ids[row], **self._project(fields, projection)}
+
+    def _to_document(self, row: int, projection: list[str] | None = None) -> Document:
+        record = self._records[row]
+        return Document(
+            id=self._ids[row],
+            page_content=record["text"],
+            metadata=self._project(record["metadata"], projection),
+        )
+
+
+@register_store("memory")
+def create_memory_store(settings: StoreSettings, embeddings: Embeddings | None = None):
+    memory = settings.memory or MemoryStoreSettings()
+
+    if embeddings is None and settings.embeddings:
+        embeddings = create_embeddings(settings.embeddings)
+
+    quantization = settings.embeddings.quantization if settings.embeddings else "none"
+    store = MemoryStore(
+        embeddings=embeddings,
+        index=memory.index,
+        nlist=memory.nlist,
+        nprobe=memory.nprobe,
+        quantization=quantization,
+        rescore_factor=settings.embeddings.rescore_factor if settings.embeddings else 4,
+    )
+    if memory.snapshot_path and Path(memory.snapshot_path).exists():
+        store.load(memory.snapshot_path)
+    return store
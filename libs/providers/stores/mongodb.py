@@ -1,84 +1,662 @@
+import asyncio
+import time
+
 import certifi
+import numpy as np
 
+from bson import ObjectId
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 
-from langchain_mongodb import MongoDBAtlasVectorSearch
-from langchain_mongodb.retrievers import MongoDBAtlasHybridSearchRetriever
-
-from pymongo import MongoClient
-from pymongo.collection import Collection
+from pymongo import AsyncMongoClient, ReplaceOne, UpdateOne
+from pymongo.errors import OperationFailure
+from pymongo.operations import SearchIndexModel
+from pymongo.asynchronous.collection import AsyncCollection
 
+from libs.core.factory import create_embeddings
 from libs.core.stores.base import BaseStore
-from libs.core.registry import EMBEDDING_PROVIDERS, register_store
-from libs.core.settings import StoreSettings
+from libs.core.stores.cache import SearchResultCache
+from libs.core.registry import register_store
+from libs.core.settings import MongoDBSettings, StoreSettings
+
+TEXT_KEY = "text"
+EMBEDDING_KEY = "embedding"
+
+# Atlas automatic quantization names for our quantization modes
+ATLAS_QUANTIZATION = {"int8": "scalar", "binary": "binary"}
+
+# Seconds between index checks while a filter path is not yet searchable
+INDEX_RECHECK_SECONDS = 60.0
+
+
+def vector_index_definition(
+    dimensions: int,
+    filter_fields: list[str],
+    similarity: str = "cosine",
+    quantization: str = "none",
+) -> dict:
+    """
+    Atlas Vector Search index with `filter_fields` indexed for pre-filtering.
+    With `quantization` set, Atlas keeps int8/binary vectors in the index and
+    the full-fidelity vectors on the documents for rescoring.
+    """
+    vector_field = {
+        "type": "vector",
+        "path": EMBEDDING_KEY,
+        "numDimensions": dimensions,
+        "similarity": similarity,
+    }
+    if quantization in ATLAS_QUANTIZATION:
+        vector_field["quantization"] = ATLAS_QUANTIZATION[quantization]
+    return {
+        "fields": [
+            vector_field,
+            *({"type": "filter", "path": field} for field in filter_fields),
+        ]
+    }
+
+
+def search_index_definition(filter_fields: list[str]) -> dict:
+    """Atlas Search index over the text, with `filter_fields` as exact tokens."""
+    return {
+        "mappings": {
+            "dynamic": False,
+            "fields": {
+                TEXT_KEY: {"type": "string"},
+                **{field: {"type": "token"} for field in filter_fields},
+            },
+        }
+    }
+
+
+def filter_paths(kind: str, definition: dict) -> frozenset[str]:
+    """Paths a `vectorSearch` / `search` index definition can filter on."""
+    if kind == "vectorSearch":
+        return frozenset(
+            field["path"]
+            for field in definition.get("fields", [])
+            if field.get("type") == "filter"
+        )
+    fields = definition.get("mappings", {}).get("fields", {})
+    return frozenset(
+        path
+        for path, spec in fields.items()
+        if isinstance(spec, dict) and spec.get("type") == "token"
+    )
+
+
+def _vector_field(definition: dict) -> dict | None:
+    return next(
+        (f for f in definition.get("fields", []) if f.get("type") == "vector"), None
+    )
+
+
+def same_index(kind: str, current: dict, wanted: dict) -> bool:
+    """Whether an existing definition already matches the wanted one."""
+    if filter_paths(kind, current) != filter_paths(kind, wanted):
+        return False
+    return kind != "vectorSearch" or _vector_field(current) == _vector_field(wanted)
+
+
+def vector_search_filter(filters: dict | None) -> dict | None:
+    """Translate `{field: value | [values]}` into a `$vectorSearch` filter."""
+    if not filters:
+        return None
+    clauses = [
+        {field: {"$in": value} if isinstance(value, list) else {"$eq": value}}
+        for field, value in filters.items()
+    ]
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def search_filter_clauses(filters: dict | None) -> list[dict]:
+    """Translate `{field: value | [values]}` into `$search` compound filters."""
+    return [
+        {
+            "in": {
+                "path": field,
+                "value": value if isinstance(value, list) else [value],
+            }
+        }
+        for field, value in (filters or {}).items()
+    ]
 
 
 class MongoDBStore(BaseStore):
+    """
+    Native async MongoDB Atlas store.
+
+    All I/O goes through PyMongo's async client, and vector / hybrid search
+    are issued as `$vectorSearch` / `$search` aggregations, so catalog
+    lookups never block the event loop. Documents use the same layout as
+    `MongoDBAtlasVectorSearch` (`_id`, `text`, `embedding`, metadata fields).
+
+    With `filter_fields` set, the store keeps its search indexes in line
+    with them (see `ensure_search_indexes`) and only sends search filters
+    on paths the serving index covers; filters on other paths are dropped
+    rather than failing the search.
+    """
+
     def __init__(
         self,
-        collection: Collection,
-        vector_store: MongoDBAtlasVectorSearch = None,
+        collection: AsyncCollection,
+        embeddings: Embeddings | None = None,
+        vector_index_name: str | None = None,
         search_index_name: str | None = None,
+        oversampling_factor: int = 10,
+        rrf_penalty: int = 60,
+        embedding_batch_size: int = 96,
+        embedding_concurrency: int = 4,
+        result_cache: SearchResultCache | None = None,
+        quantization: str = "none",
+        rescore_factor: int = 4,
+        filter_fields: list[str] | None = None,
+        dimensions: int | None = None,
     ):
         self.collection = collection
-        self.vector_store = vector_store
-        self.hybrid_retriever = (
-            MongoDBAtlasHybridSearchRetriever(
-                vectorstore=vector_store, search_index_name=search_index_name
-            )
-            if vector_store and search_index_name
-            else None
+        self.embeddings = embeddings
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_concurrency = embedding_concurrency
+        self.vector_index_name = vector_index_name
+        self.search_index_name = search_index_name
+        self.oversampling_factor = oversampling_factor
+        self.rrf_penalty = rrf_penalty
+        self.result_cache = result_cache
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.filter_fields = filter_fields
+        self.dimensions = dimensions
+        # Filterable paths per index type, as last seen on the server
+        self._filterable: dict[str, frozenset[str]] | None = None
+        self._next_index_check = 0.0
+        self._index_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Key/value access
+    # ------------------------------------------------------------------
+
+    async def get(self, key: str):
+        return await self.collection.find_one({"_id": key})
+
+    async def put(self, document: Document):
+        self._require_embeddings("put")
+        await self._upsert(
+            [document.id or str(ObjectId())],
+            [document.page_content],
+            [document.metadata],
         )
+        self._invalidate()
 
-    def get(self, key: str):
-        return self.collection.find_one({"_id": key})
+    async def delete(self, key: str):
+        await self.collection.delete_one({"_id": key})
+        self._invalidate()
 
-    def put(self, document: Document):
-        if not self.vector_store:
-            raise RuntimeError("No vector store configured")
-        self.vector_store.add_documents(documents=[document])
+    async def delete_many(self, keys: list[str]):
+        if not keys:
+            return
+        await self.collection.delete_many({"_id": {"$in": keys}})
+        self._invalidate()
 
-    def delete(self, key: str):
-        self.collection.delete_one({"_id": key})
+    async def query(
+        self, filters: dict, limit=20, offset=0, after=None, projection=None
+    ):
+        filters = dict(filters or {})
+        if after is not None:
+            filters["_id"] = {"$gt": after}
+        cursor = self.collection.find(filters, self._find_projection(projection))
+        cursor = cursor.sort("_id", 1)
+        if offset:
+            cursor = cursor.skip(offset)
+        return await cursor.limit(limit).to_list()
 
-    def query(self, filters: dict, limit=20, offset=0):
-        cursor = self.collection.find(filters).skip(offset).limit(limit)
-        return list(cursor)
+    async def iter_query(
+        self,
+        filters: dict | None = None,
+        batch_size: int = 500,
+        projection: list[str] | None = None,
+    ):
+        cursor = self.collection.find(filters or {}, self._find_projection(projection))
+        cursor = cursor.sort("_id", 1)
+        async for doc in cursor.batch_size(batch_size):
+            yield doc
 
-    def upsert_text(self, id: str, text: str, metadata: dict | None = None):
-        if not self.vector_store:
-            raise RuntimeError("No vector store configured")
-        self.vector_store.add_texts([text], metadatas=[metadata or {}], ids=[id])
+    async def upsert_text(self, id: str, text: str, metadata: dict | None = None):
+        self._require_embeddings("upsert_text")
+        await self._upsert([id], [text], [metadata or {}])
+        self._invalidate()
 
-    def similarity_search(self, query: str, k: int = 5):
-        if not self.vector_store:
-            raise RuntimeError("Similarity search requires a vector store")
-        return self.vector_store.similarity_search(query, k=k)
+    async def upsert_texts(
+        self, ids: list[str], texts: list[str], metadatas: list[dict]
+    ):
+        self._require_embeddings("upsert_texts")
+        await self._upsert(ids, texts, metadatas)
+        self._invalidate()
+
+    async def update_metadata(self, updates: dict[str, dict]):
+        if not updates:
+            return
+        operations = [
+            UpdateOne({"_id": id}, {"$set": metadata})
+            for id, metadata in updates.items()
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+        self._invalidate()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ):
+        self._require_embeddings("Similarity search")
+        return await self._cached(
+            "similarity",
+            query,
+            k,
+            self._similarity_search,
+            filters=filters,
+            projection=projection,
+        )
 
-    def hybrid_search(self, query: str):
-        if not self.hybrid_retriever:
+    async def hybrid_search(
+        self,
+        query: str,
+        k: int = 4,
+        filters: dict | None = None,
+        projection: list[str] | None = None,
+    ):
+        if not self.embeddings or not self.search_index_name:
             raise RuntimeError("Hybrid search requires a vector store")
-        return self.hybrid_retriever.invoke(input=query)
+        return await self._cached(
+            "hybrid",
+            query,
+            k,
+            self._hybrid_search,
+            filters=filters,
+            projection=projection,
+        )
+
+    async def ensure_search_indexes(
+        self, dimensions: int | None = None, filter_fields: list[str] | None = None
+    ) -> None:
+        """
+        Create missing vector / full-text indexes and update existing ones
+        whose filter paths or vector options differ from the wanted
+        definition. Dimensions default to the configured value, else to the
+        size of a probe embedding.
+
+        Atlas keeps serving the old definition while a new one builds, so a
+        filter path only becomes usable once its index reports READY;
+        searches drop filters on other paths until a later check sees it.
+        """
+        if filter_fields is None:
+            filter_fields = self.filter_fields or []
+        if dimensions is None:
+            dimensions = self.dimensions
+        if dimensions is None and self.embeddings and self.vector_index_name:
+            dimensions = len(await self.embeddings.aembed_query("dimensions"))
+
+        wanted = []
+        if self.vector_index_name and dimensions:
+            wanted.append(
+                (
+                    "vectorSearch",
+                    self.vector_index_name,
+                    vector_index_definition(
+                        dimensions, filter_fields, quantization=self.quantization
+                    ),
+                )
+            )
+        if self.search_index_name:
+            wanted.append(
+                ("search", self.search_index_name, search_index_definition(filter_fields))
+            )
+
+        existing = {
+            index["name"]: index
+            async for index in await self.collection.list_search_indexes()
+        }
+        filterable = {}
+        missing = []
+        for kind, name, definition in wanted:
+            index = existing.get(name)
+            filterable[kind] = frozenset()
+            if index is None:
+                missing.append(SearchIndexModel(definition=definition, name=name, type=kind))
+            elif not same_index(kind, index.get("latestDefinition", {}), definition):
+                await self.collection.update_search_index(name, definition)
+            elif index.get("status") == "READY":
+                filterable[kind] = filter_paths(kind, definition)
+        if missing:
+            await self.collection.create_search_indexes(missing)
+
+        if filterable != self._filterable:
+            # Results cached while filters were dropped are now wrong
+            self._invalidate()
+        self._filterable = filterable
+        ready = bool(filterable) and all(
+            paths >= frozenset(filter_fields) for paths in filterable.values()
+        )
+        self._next_index_check = (
+            float("inf") if ready else time.monotonic() + INDEX_RECHECK_SECONDS
+        )
+
+    async def close(self):
+        await self.collection.database.client.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _check_indexes(self) -> None:
+        """Run `ensure_search_indexes` until every filter field is searchable."""
+        if self.filter_fields is None or time.monotonic() < self._next_index_check:
+            return
+        async with self._index_lock:
+            if time.monotonic() < self._next_index_check:
+                return
+            try:
+                await self.ensure_search_indexes()
+            except OperationFailure:
+                # e.g. no index privileges; search unfiltered and retry later
+                self._filterable = {}
+                self._next_index_check = time.monotonic() + INDEX_RECHECK_SECONDS
+
+    def _usable_filters(self, kind: str, filters: dict | None) -> dict | None:
+        if not filters or self.filter_fields is None:
+            return filters
+        paths = (self._filterable or {}).get(kind, frozenset())
+        return {field: value for field, value in filters.items() if field in paths}
+
+    async def _cached(self, kind: str, query: str, k: int, search, **options):
+        await self._check_indexes()
+        cache = self.result_cache
+        if cache is None:
+            return await search(query, k, **options)
+
+        key = cache.key(kind, query, k, **options)
+        results = cache.get(key)
+        if results is None:
+            generation = cache.generation
+            results = await search(query, k, **options)
+            cache.set(key, results, generation)
+        return results
+
+    def _invalidate(self):
+        self.generation += 1
+        if self.result_cache is not None:
+            self.result_cache.invalidate()
+
+    async def _similarity_search(
+        self, query: str, k: int, filters=None, projection=None
+    ):
+        query_vector = await self.embeddings.aembed_query(query)
+        if self.quantization != "none":
+            return await self._rescored_search(query_vector, k, filters, projection)
+
+        pipeline = [
+            self._vector_search_stage(query_vector, k, filters),
+            self._project_stage(projection),
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        return [self._to_document(doc) async for doc in cursor]
+
+    async def _rescored_search(self, query_vector, k: int, filters, projection):
+        """
+        Over-fetch `k * rescore_factor` hits from the quantized index, then
+        rank them exactly against their stored float vectors.
+        """
+        pipeline = [
+            self._vector_search_stage(query_vector, k * self.rescore_factor, filters)
+        ]
+        if projection is not None:
+            fields = [TEXT_KEY, EMBEDDING_KEY, *projection]
+            pipeline.append({"$project": {field: 1 for field in fields}})
+        cursor = await self.collection.aggregate(pipeline)
+        candidates = await cursor.to_list()
+        if not candidates:
+            return []
+
+        vectors = np.asarray(
+            [doc.pop(EMBEDDING_KEY) for doc in candidates], dtype=np.float32
+        )
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True).clip(1e-12)
+        query = np.asarray(query_vector, dtype=np.float32)
+        order = np.argsort(vectors @ query)[::-1][:k]
+        return [self._to_document(candidates[i]) for i in order]
+
+    async def _hybrid_search(
+        self, query: str, k: int, filters=None, projection=None
+    ):
+        query_vector = await self.embeddings.aembed_query(query)
+
+        # Project before fusing so embeddings and unused fields never travel
+        # through $unionWith / $group
+        if self.quantization != "none":
+            vector_stages = [
+                self._vector_search_stage(
+                    query_vector, k * self.rescore_factor, filters
+                ),
+                *self._rescore_stages(query_vector, k),
+            ]
+        else:
+            vector_stages = [self._vector_search_stage(query_vector, k, filters)]
+        vector_pipeline = [
+            *vector_stages,
+            self._project_stage(projection),
+            *self._reciprocal_rank_stages("vector_score"),
+        ]
+        compound = {"must": [{"text": {"query": query, "path": TEXT_KEY}}]}
+        search_filters = self._usable_filters("search", filters)
+        if search_filters:
+            compound["filter"] = search_filter_clauses(search_filters)
+        fulltext_pipeline = [
+            {"$search": {"index": self.search_index_name, "compound": compound}},
+            {"$limit": k},
+            self._project_stage(projection),
+            *self._reciprocal_rank_stages("fulltext_score"),
+        ]
+        pipeline = [
+            *vector_pipeline,
+            {
+                "$unionWith": {
+                    "coll": self.collection.name,
+                    "pipeline": fulltext_pipeline,
+                }
+            },
+            {"$group": {"_id": "$_id", "doc": {"$mergeObjects": "$$ROOT"}}},
+            {"$replaceRoot": {"newRoot": "$doc"}},
+            {
+                "$set": {
+                    "vector_score": {"$ifNull": ["$vector_score", 0]},
+                    "fulltext_score": {"$ifNull": ["$fulltext_score", 0]},
+                }
+            },
+            {"$addFields": {"score": {"$add": ["$vector_score", "$fulltext_score"]}}},
+            {"$sort": {"score": -1}},
+            {"$limit": k},
+            {"$project": {"score": 0, "vector_score": 0, "fulltext_score": 0}},
+        ]
+        cursor = await self.collection.aggregate(pipeline)
+        return [self._to_document(doc) async for doc in cursor]
+
+    def _require_embeddings(self, operation: str):
+        if not self.embeddings:
+            raise RuntimeError(f"{operation} requires a vector store")
+
+    async def _upsert(self, ids: list[str], texts: list[str], metadatas: list[dict]):
+        if not ids:
+            return
+        vectors = await self._embed_documents(texts)
+        operations = [
+            ReplaceOne(
+                {"_id": id},
+                {**metadata, TEXT_KEY: text, EMBEDDING_KEY: vector},
+                upsert=True,
+            )
+            for id, text, metadata, vector in zip(ids, texts, metadatas, vectors)
+        ]
+        await self.collection.bulk_write(operations, ordered=False)
+
+    async def _embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed texts in provider-sized batches, keeping at most
+        `embedding_concurrency` requests in flight.
+        """
+        size = self.embedding_batch_size
+        if len(texts) <= size:
+            return await self.embeddings.aembed_documents(texts)
+
+        semaphore = asyncio.Semaphore(self.embedding_concurrency)
+
+        async def embed_batch(batch: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents(batch)
+
+        batches = await asyncio.gather(
+            *(embed_batch(texts[i : i + size]) for i in range(0, len(texts), size))
+        )
+        return [vector for batch in batches for vector in batch]
+
+    def _vector_search_stage(
+        self, query_vector: list[float], k: int, filters: dict | None = None
+    ) -> dict:
+        stage = {
+            "index": self.vector_index_name,
+            "path": EMBEDDING_KEY,
+            "queryVector": query_vector,
+            "numCandidates": k * self.oversampling_factor,
+            "limit": k,
+        }
+        pre_filter = vector_search_filter(self._usable_filters("vectorSearch", filters))
+        if pre_filter:
+            stage["filter"] = pre_filter
+        return {"$vectorSearch": stage}
+
+    def _rescore_stages(self, query_vector: list[float], k: int) -> list[dict]:
+        """
+        Server-side counterpart of `_rescored_search`: rank over-fetched
+        quantized hits by exact cosine against their stored float vectors.
+        """
+        dot = {
+            "$reduce": {
+                "input": {"$zip": {"inputs": [f"${EMBEDDING_KEY}", query_vector]}},
+                "initialValue": 0.0,
+                "in": {
+                    "$add": [
+                        "$$value",
+                        {
+                            "$multiply": [
+                                {"$arrayElemAt": ["$$this", 0]},
+                                {"$arrayElemAt": ["$$this", 1]},
+                            ]
+                        },
+                    ]
+                },
+            }
+        }
+        norm = {
+            "$sqrt": {
+                "$reduce": {
+                    "input": f"${EMBEDDING_KEY}",
+                    "initialValue": 0.0,
+                    "in": {"$add": ["$$value", {"$multiply": ["$$this", "$$this"]}]},
+                }
+            }
+        }
+        return [
+            {"$addFields": {"exact_score": {"$divide": [dot, {"$max": [norm, 1e-12]}]}}},
+            {"$sort": {"exact_score": -1}},
+            {"$limit": k},
+            {"$unset": "exact_score"},
+        ]
+
+    def _find_projection(self, projection: list[str] | None) -> dict | list[str]:
+        # Embeddings are kilobytes per document; only search reads them
+        if projection is None:
+            return {EMBEDDING_KEY: 0}
+        return projection
+
+    def _project_stage(self, projection: list[str] | None) -> dict:
+        if projection is None:
+            return {"$project": {EMBEDDING_KEY: 0}}
+        return {"$project": {TEXT_KEY: 1, **{field: 1 for field in projection}}}
+
+    def _reciprocal_rank_stages(self, score_field: str) -> list[dict]:
+        """Score each ranked hit as 1 / (rank + penalty + 1)."""
+        return [
+            {"$group": {"_id": None, "docs": {"$push": "$$ROOT"}}},
+            {"$unwind": {"path": "$docs", "includeArrayIndex": "rank"}},
+            {
+                "$addFields": {
+                    f"docs.{score_field}": {
+                        "$divide": [1.0, {"$add": ["$rank", self.rrf_penalty, 1]}]
+                    }
+                }
+            },
+            {"$replaceRoot": {"newRoot": "$docs"}},
+        ]
+
+    def _to_document(self, doc: dict) -> Document:
+        doc_id = doc.pop("_id", None)
+        text = doc.pop(TEXT_KEY, "")
+        return Document(
+            id=str(doc_id) if doc_id is not None else None,
+            page_content=text,
+            metadata=doc,
+        )
+
+
+def client_options(mongodb: MongoDBSettings) -> dict:
+    """TLS and pool options shared by every Mongo client the app opens."""
+    return {
+        "tlsCAFile": certifi.where(),
+        "maxPoolSize": mongodb.max_pool_size,
+        "minPoolSize": mongodb.min_pool_size,
+        "maxIdleTimeMS": mongodb.max_idle_time_ms,
+        "connectTimeoutMS": mongodb.connect_timeout_ms,
+        "socketTimeoutMS": mongodb.socket_timeout_ms,
+        "serverSelectionTimeoutMS": mongodb.server_selection_timeout_ms,
+        "waitQueueTimeoutMS": mongodb.wait_queue_timeout_ms,
+    }
 
 
 @register_store("mongodb")
-def create_mongo_store(settings: StoreSettings):
-    client = MongoClient(settings.mongodb.uri, tlsCAFile=certifi.where())
-    collection = client[settings.mongodb.database][settings.mongodb.collection]
+def create_mongo_store(settings: StoreSettings, embeddings: Embeddings | None = None):
+    mongodb = settings.mongodb
+    client = AsyncMongoClient(mongodb.uri, **client_options(mongodb))
+    collection = client[mongodb.database][mongodb.collection]
 
-    vector_store = None
+    embedding_options = {}
     if settings.embeddings:
-        embeddings_factory = EMBEDDING_PROVIDERS[settings.embeddings.provider]
-        embeddings = embeddings_factory(settings.embeddings)
+        embedding_options = {
+            "embedding_batch_size": settings.embeddings.batch_size,
+            "embedding_concurrency": settings.embeddings.max_concurrency,
+            "quantization": settings.embeddings.quantization,
+            "rescore_factor": settings.embeddings.rescore_factor,
+            "dimensions": settings.embeddings.dimensions,
+        }
+        if embeddings is None:
+            embeddings = create_embeddings(settings.embeddings)
 
-        vector_store = MongoDBAtlasVectorSearch(
-            collection=collection,
-            embedding=embeddings,
-            index_name=settings.mongodb.vector_index,
+    result_cache = None
+    if settings.result_cache and settings.result_cache.enabled:
+        result_cache = SearchResultCache(
+            ttl_seconds=settings.result_cache.ttl_seconds,
+            max_entries=settings.result_cache.max_entries,
         )
 
     return MongoDBStore(
         collection=collection,
-        vector_store=vector_store,
-        search_index_name=settings.mongodb.search_index
+        embeddings=embeddings,
+        vector_index_name=mongodb.vector_index,
+        search_index_name=mongodb.search_index,
+        result_cache=result_cache,
+        filter_fields=mongodb.filter_fields,
+        **embedding_options,
     )
@@ -4,7 +4,9 @@ from abc import ABC, abstractmethod
 from datetime import datetime, timezone
 from typing import Optional
 
-from libs.core.factory import create_http_client
+from pydantic import BaseModel
+
+from libs.core.factory import get_resources
 from libs.core.settings import PegasusSettings
 
 API_VERSION = "2025-09-29"
@@ -13,8 +15,8 @@ USER_AGENT = "Pegasus-User"
 
 class BaseService(ABC):
     def __init__(self, settings: PegasusSettings) -> None:
-        self._http = create_http_client(settings)
-        
+        self._http = get_resources(settings).http
+
     @abstractmethod
     async def _handle_request(self, coro):
         pass
@@ -26,6 +28,10 @@ class BaseService(ABC):
             .replace("+00:00", "Z")
         )
 
+    def _json_body(self, model: BaseModel, **kwargs) -> bytes:
+        """Serialize a request model straight to JSON bytes."""
+        return model.model_dump_json(**kwargs).encode()
+
     def _new_idempotency_key(self) -> str:
         from uuid import uuid4
 
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from checkout.schemas import CheckoutSession
+
+# Sessions in these states no longer change on the merchant side
+TERMINAL_STATUSES = frozenset({"completed", "canceled"})
+
+
+@dataclass
+class SessionCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    webhook_updates: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class CheckoutSessionCache:
+    """
+    Last known state of each checkout session.
+
+    Filled from every create/update/complete/get response and kept current
+    by order webhooks, so `CheckoutService.get_session` can answer polls
+    locally. An entry is served while it is younger than `max_age_seconds`,
+    or until a webhook says otherwise for sessions in a terminal state.
+    Share one instance between `CheckoutService` and `OrderService`.
+    """
+
+    def __init__(self, max_age_seconds: float = 10.0, max_entries: int = 10000) -> None:
+        self.max_age_seconds = max_age_seconds
+        self.max_entries = max_entries
+        self.stats = SessionCacheStats()
+        self._entries: OrderedDict[str, tuple[float, CheckoutSession]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, checkout_session_id: str, max_age: Optional[float] = None
+    ) -> CheckoutSession | None:
+        entry = self._entries.get(checkout_session_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        stored_at, session = entry
+        # Terminal sessions only expire when the caller asks for a bound
+        if max_age is None:
+            max_age = self.max_age_seconds
+            if session.status in TERMINAL_STATUSES:
+                max_age = float("inf")
+        if time.monotonic() - stored_at > max_age:
+            self.stats.stale += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(checkout_session_id)
+        self.stats.hits += 1
+        return session
+
+    def put(self, session) -> None:
+        if not isinstance(session, CheckoutSession):
+            # e.g. CheckoutSessionWithOrder from complete_session
+            session = CheckoutSession.model_construct(
+                **{name: getattr(session, name) for name in CheckoutSession.model_fields}
+            )
+        self._entries[session.id] = (time.monotonic(), session)
+        self._entries.move_to_end(session.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, checkout_session_id: str) -> None:
+        self._entries.pop(checkout_session_id, None)
+
+    def apply_event(self, event) -> None:
+        """
+        Update from an order webhook. `order_create` means the session was
+        completed; other events change the order in ways the session
+        snapshot cannot express, so the entry is dropped and the next
+        `get_session` refetches it.
+        """
+        checkout_session_id = event.data.checkout_session_id
+        entry = self._entries.get(checkout_session_id)
+        if entry is None:
+            return
+
+        self.stats.webhook_updates += 1
+        if event.type == "order_create":
+            _, session = entry
+            self._entries[checkout_session_id] = (
+                time.monotonic(),
+                session.model_copy(update={"status": "completed"}),
+            )
+        else:
+            self.invalidate(checkout_session_id)
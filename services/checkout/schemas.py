@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import List, Optional, Union, Literal
+from typing import Annotated, List, Optional, Union, Literal
 
 from pydantic import BaseModel, EmailStr, Field, ConfigDict
 
@@ -106,9 +106,10 @@ class FulfillmentOptionDigital(BaseModel):
     total: int
 
 
-FulfillmentOption = Union[
-    FulfillmentOptionShipping,
-    FulfillmentOptionDigital,
+# Discriminated on `type` so validation goes straight to the right model
+FulfillmentOption = Annotated[
+    Union[FulfillmentOptionShipping, FulfillmentOptionDigital],
+    Field(discriminator="type"),
 ]
 
 
@@ -138,7 +139,7 @@ class MessageError(BaseModel):
     content: str
 
 
-Message = Union[MessageInfo, MessageError]
+Message = Annotated[Union[MessageInfo, MessageError], Field(discriminator="type")]
 
 
 class Link(BaseModel):
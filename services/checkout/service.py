@@ -12,6 +12,10 @@ from checkout.schemas import (
     Error,
 )
 
+from checkout.cache import CheckoutSessionCache
+from libs.core.factory import get_resources
+from libs.core.http import Timeout
+from libs.core.settings import PegasusSettings
 from services.base import BaseService
 
 API_VERSION = "2025-09-29"
@@ -26,8 +30,23 @@ class CheckoutService(BaseService):
     - Create checkout sessions
     - Mutate checkout state
     - Complete checkout with delegated payment
+
+    With a session cache, every session returned by the API is remembered
+    and `get_session` answers from it while the entry is fresh. The cache
+    defaults to the process-wide one in `Resources`, which `OrderService`
+    should be given too.
     """
 
+    def __init__(
+        self,
+        settings: PegasusSettings,
+        session_cache: Optional[CheckoutSessionCache] = None,
+    ) -> None:
+        super().__init__(settings)
+        if session_cache is None:
+            session_cache = get_resources(settings).session_cache
+        self._sessions = session_cache
+
     # ------------------------------------------------------------------
     # Internals
     # ------------------------------------------------------------------
@@ -62,6 +81,11 @@ class CheckoutService(BaseService):
 
         return headers
 
+    def _remember(self, session):
+        if self._sessions is not None:
+            self._sessions.put(session)
+        return session
+
     async def _handle_request(self, coro):
         """
         Centralized HTTP error handling.
@@ -92,41 +116,62 @@ class CheckoutService(BaseService):
         request_id: Optional[str] = None,
         signature: Optional[str] = None,
         timestamp: Optional[str] = None,
+        timeout: Timeout = None,
     ) -> CheckoutSession:
         """POST /agentic_checkout/sessions"""
         response = await self._handle_request(
-            self._http.post(
+            self._http.post_raw(
                 path=CHECKOUT_BASE_PATH,
-                json=request.model_dump(mode="json"),
+                endpoint="checkout.create_session",
+                content=self._json_body(request),
                 headers=self._headers(
                     idempotency_key=idempotency_key or self._new_idempotency_key(),
                     request_id=request_id,
                     signature=signature,
                     timestamp=timestamp or self._now_rfc3339(),
                 ),
+                timeout=timeout,
             )
         )
-        return CheckoutSession.model_validate(response)
+        return self._remember(CheckoutSession.model_validate_json(response))
 
     async def get_session(
         self,
         checkout_session_id: str,
         *,
         request_id: Optional[str] = None,
+        timeout: Timeout = None,
+        max_age: Optional[float] = None,
+        coalesce: bool = True,
     ) -> CheckoutSession:
-        """GET /agentic_checkout/sessions/{id}"""
+        """
+        GET /agentic_checkout/sessions/{id}
+
+        Served from the session cache when the cached state is at most
+        `max_age` seconds old (the cache's default when None); pass 0 to
+        always ask the merchant. Concurrent fetches of the same session
+        share one request unless `coalesce` is False.
+        """
+        if self._sessions is not None:
+            cached = self._sessions.get(checkout_session_id, max_age)
+            if cached is not None:
+                return cached
+
         response = await self._handle_request(
-            self._http.get(
+            self._http.get_raw(
                 path=f"{CHECKOUT_BASE_PATH}/{checkout_session_id}",
+                endpoint="checkout.get_session",
+                coalesce=coalesce,
                 headers=self._headers(
                     idempotency_key=None,
                     request_id=request_id,
                     signature=None,
                     timestamp=None,
                 ),
+                timeout=timeout,
             )
         )
-        return CheckoutSession.model_validate(response)
+        return self._remember(CheckoutSession.model_validate_json(response))
 
     async def update_session(
         self,
@@ -137,21 +182,24 @@ class CheckoutService(BaseService):
         request_id: Optional[str] = None,
         signature: Optional[str] = None,
         timestamp: Optional[str] = None,
+        timeout: Timeout = None,
     ) -> CheckoutSession:
         """PATCH /agentic_checkout/sessions/{id}"""
         response = await self._handle_request(
-            self._http.patch(
+            self._http.patch_raw(
                 path=f"{CHECKOUT_BASE_PATH}/{checkout_session_id}",
-                json=request.model_dump(mode="json", exclude_unset=True),
+                endpoint="checkout.update_session",
+                content=self._json_body(request, exclude_unset=True),
                 headers=self._headers(
                     idempotency_key=idempotency_key or self._new_idempotency_key(),
                     request_id=request_id,
                     signature=signature,
                     timestamp=timestamp or self._now_rfc3339(),
                 ),
+                timeout=timeout,
             )
         )
-        return CheckoutSession.model_validate(response)
+        return self._remember(CheckoutSession.model_validate_json(response))
 
     async def complete_session(
         self,
@@ -162,18 +210,21 @@ class CheckoutService(BaseService):
         request_id: Optional[str] = None,
         signature: Optional[str] = None,
         timestamp: Optional[str] = None,
+        timeout: Timeout = None,
     ) -> CheckoutSessionWithOrder:
         """POST /agentic_checkout/sessions/{id}/complete"""
         response = await self._handle_request(
-            self._http.post(
+            self._http.post_raw(
                 path=f"{CHECKOUT_BASE_PATH}/{checkout_session_id}/complete",
-                json=request.model_dump(mode="json"),
+                endpoint="checkout.complete_session",
+                content=self._json_body(request),
                 headers=self._headers(
                     idempotency_key=idempotency_key or self._new_idempotency_key(),
                     request_id=request_id,
                     signature=signature,
                     timestamp=timestamp or self._now_rfc3339(),
                 ),
+                timeout=timeout,
             )
         )
-        return CheckoutSessionWithOrder.model_validate(response)
+        return self._remember(CheckoutSessionWithOrder.model_validate_json(response))
@@ -3,7 +3,7 @@ from typing import List, Optional, Annotated
 from datetime import date
 from pydantic import (
     BaseModel,
-    field,
+    Field,
     HttpUrl,
     constr,
     conint,
@@ -77,144 +77,144 @@ class Product(BaseModel):
     # -----------------------------
     # OpenAI Flags
     # -----------------------------
-    enable_search: BooleanEnum = field()
-    enable_checkout: BooleanEnum = field()
+    enable_search: BooleanEnum = Field()
+    enable_checkout: BooleanEnum = Field()
 
     # -----------------------------
     # Basic Product Data
     # -----------------------------
-    id: Annotated[str, constr(max_length=100)] = field()
-    gtin: Optional[Annotated[str, constr(regex=r"^\d{8,14}$")]] = field(default=None)
-    mpn: Optional[Annotated[str, constr(max_length=70)]] = field(default=None)
-    title: Annotated[str, constr(max_length=150)] = field()
-    description: Annotated[str, constr(max_length=5000)] = field()
-    link: HttpUrl = field()
+    id: Annotated[str, constr(max_length=100)] = Field()
+    gtin: Optional[Annotated[str, constr(pattern=r"^\d{8,14}$")]] = Field(default=None)
+    mpn: Optional[Annotated[str, constr(max_length=70)]] = Field(default=None)
+    title: Annotated[str, constr(max_length=150)] = Field()
+    description: Annotated[str, constr(max_length=5000)] = Field()
+    link: HttpUrl = Field()
 
     # -----------------------------
     # Item Information
     # -----------------------------
-    condition: Optional[ConditionEnum] = field(default=ConditionEnum.new)
-    product_category: str = field()
-    brand: Annotated[str, constr(max_length=70)] = field()
-    material: Annotated[str, constr(max_length=100)] = field()
-    dimensions: Optional[str] = field(default=None)
-    length: Optional[str] = field(default=None)
-    width: Optional[str] = field(default=None)
-    height: Optional[str] = field(default=None)
-    weight: str = field()
-    age_group: Optional[AgeGroupEnum] = field(default=None)
+    condition: Optional[ConditionEnum] = Field(default=ConditionEnum.new)
+    product_category: str = Field()
+    brand: Annotated[str, constr(max_length=70)] = Field()
+    material: Annotated[str, constr(max_length=100)] = Field()
+    dimensions: Optional[str] = Field(default=None)
+    length: Optional[str] = Field(default=None)
+    width: Optional[str] = Field(default=None)
+    height: Optional[str] = Field(default=None)
+    weight: str = Field()
+    age_group: Optional[AgeGroupEnum] = Field(default=None)
 
     # -----------------------------
     # Media
     # -----------------------------
-    image_link: HttpUrl = field()
-    additional_image_link: Optional[List[HttpUrl]] = field(default=None)
-    video_link: Optional[HttpUrl] = field(default=None)
-    model_3d_link: Optional[HttpUrl] = field(default=None)
+    image_link: HttpUrl = Field()
+    additional_image_link: Optional[List[HttpUrl]] = Field(default=None)
+    video_link: Optional[HttpUrl] = Field(default=None)
+    model_3d_link: Optional[HttpUrl] = Field(default=None)
 
     # -----------------------------
     # Price & Promotions
     # -----------------------------
-    price: str = field()
-    sale_price: Optional[str] = field(default=None)
-    sale_price_effective_date: Optional[str] = field(default=None)
-    unit_pricing_measure: Optional[str] = field(default=None)
-    base_measure: Optional[str] = field(default=None)
-    pricing_trend: Optional[Annotated[str, constr(max_length=80)]] = field(default=None)
+    price: str = Field()
+    sale_price: Optional[str] = Field(default=None)
+    sale_price_effective_date: Optional[str] = Field(default=None)
+    unit_pricing_measure: Optional[str] = Field(default=None)
+    base_measure: Optional[str] = Field(default=None)
+    pricing_trend: Optional[Annotated[str, constr(max_length=80)]] = Field(default=None)
 
     # -----------------------------
     # Availability & Inventory
     # -----------------------------
-    availability: AvailabilityEnum = field()
-    availability_date: Optional[date] = field(default=None)
-    inventory_quantity: Annotated[int, conint(ge=0)] = field()
-    expiration_date: Optional[date] = field(default=None)
-    pickup_method: Optional[PickupMethodEnum] = field(default=None)
-    pickup_sla: Optional[str] = field(default=None)
+    availability: AvailabilityEnum = Field()
+    availability_date: Optional[date] = Field(default=None)
+    inventory_quantity: Annotated[int, conint(ge=0)] = Field()
+    expiration_date: Optional[date] = Field(default=None)
+    pickup_method: Optional[PickupMethodEnum] = Field(default=None)
+    pickup_sla: Optional[str] = Field(default=None)
 
     # -----------------------------
     # Variants
     # -----------------------------
-    item_group_id: Optional[Annotated[str, constr(max_length=70)]] = field(default=None)
-    item_group_title: Optional[Annotated[str, constr(max_length=150)]] = field(
+    item_group_id: Optional[Annotated[str, constr(max_length=70)]] = Field(default=None)
+    item_group_title: Optional[Annotated[str, constr(max_length=150)]] = Field(
         default=None
     )
-    color: Optional[Annotated[str, constr(max_length=40)]] = field(default=None)
-    size: Optional[Annotated[str, constr(max_length=20)]] = field(default=None)
-    size_system: Optional[Annotated[str, constr(min_length=2, max_length=2)]] = field(
+    color: Optional[Annotated[str, constr(max_length=40)]] = Field(default=None)
+    size: Optional[Annotated[str, constr(max_length=20)]] = Field(default=None)
+    size_system: Optional[Annotated[str, constr(min_length=2, max_length=2)]] = Field(
         default=None
     )
-    gender: Optional[GenderEnum] = field(default=None)
-    offer_id: Optional[str] = field(default=None)
-    custom_variant1_category: Optional[str] = field(default=None)
-    custom_variant1_option: Optional[str] = field(default=None)
-    custom_variant2_category: Optional[str] = field(default=None)
-    custom_variant2_option: Optional[str] = field(default=None)
-    custom_variant3_category: Optional[str] = field(default=None)
-    custom_variant3_option: Optional[str] = field(default=None)
+    gender: Optional[GenderEnum] = Field(default=None)
+    offer_id: Optional[str] = Field(default=None)
+    custom_variant1_category: Optional[str] = Field(default=None)
+    custom_variant1_option: Optional[str] = Field(default=None)
+    custom_variant2_category: Optional[str] = Field(default=None)
+    custom_variant2_option: Optional[str] = Field(default=None)
+    custom_variant3_category: Optional[str] = Field(default=None)
+    custom_variant3_option: Optional[str] = Field(default=None)
 
     # -----------------------------
     # Fulfillment
     # -----------------------------
-    shipping: Optional[List[str]] = field(default=None)
-    delivery_estimate: Optional[date] = field(default=None)
+    shipping: Optional[List[str]] = Field(default=None)
+    delivery_estimate: Optional[date] = Field(default=None)
 
     # -----------------------------
     # Merchant Info
     # -----------------------------
-    seller_name: Annotated[str, constr(max_length=70)] = field()
-    seller_url: HttpUrl = field()
-    seller_privacy_policy: Optional[HttpUrl] = field(default=None)
-    seller_tos: Optional[HttpUrl] = field(default=None)
+    seller_name: Annotated[str, constr(max_length=70)] = Field()
+    seller_url: HttpUrl = Field()
+    seller_privacy_policy: Optional[HttpUrl] = Field(default=None)
+    seller_tos: Optional[HttpUrl] = Field(default=None)
 
     # -----------------------------
     # Returns
     # -----------------------------
-    return_policy: HttpUrl = field()
-    return_window: Annotated[int, conint(gt=0)] = field()
+    return_policy: HttpUrl = Field()
+    return_window: Annotated[int, conint(gt=0)] = Field()
 
     # -----------------------------
     # Performance Signals
     # -----------------------------
-    popularity_score: Optional[Annotated[float, confloat(ge=0, le=5)]] = field(
+    popularity_score: Optional[Annotated[float, confloat(ge=0, le=5)]] = Field(
         default=None
     )
-    return_rate: Optional[Annotated[float, confloat(ge=0, le=100)]] = field(
+    return_rate: Optional[Annotated[float, confloat(ge=0, le=100)]] = Field(
         default=None
     )
 
     # -----------------------------
     # Compliance
     # -----------------------------
-    warning: Optional[str] = field(default=None)
-    warning_url: Optional[HttpUrl] = field(default=None)
-    age_restriction: Optional[Annotated[int, conint(gt=0)]] = field(default=None)
+    warning: Optional[str] = Field(default=None)
+    warning_url: Optional[HttpUrl] = Field(default=None)
+    age_restriction: Optional[Annotated[int, conint(gt=0)]] = Field(default=None)
 
     # -----------------------------
     # Reviews & Q&A
     # -----------------------------
-    product_review_count: Optional[Annotated[int, conint(ge=0)]] = field(default=None)
-    product_review_rating: Optional[Annotated[float, confloat(ge=0, le=5)]] = field(
+    product_review_count: Optional[Annotated[int, conint(ge=0)]] = Field(default=None)
+    product_review_rating: Optional[Annotated[float, confloat(ge=0, le=5)]] = Field(
         default=None
     )
-    store_review_count: Optional[Annotated[int, conint(ge=0)]] = field(default=None)
-    store_review_rating: Optional[Annotated[float, confloat(ge=0, le=5)]] = field(
+    store_review_count: Optional[Annotated[int, conint(ge=0)]] = Field(default=None)
+    store_review_rating: Optional[Annotated[float, confloat(ge=0, le=5)]] = Field(
         default=None
     )
-    q_and_a: Optional[str] = field(default=None)
-    raw_review_data: Optional[str] = field(default=None)
+    q_and_a: Optional[str] = Field(default=None)
+    raw_review_data: Optional[str] = Field(default=None)
 
     # -----------------------------
     # Related Products
     # -----------------------------
-    related_product_id: Optional[List[str]] = field(default=None)
-    relationship_type: Optional[RelationshipTypeEnum] = field(default=None)
+    related_product_id: Optional[List[str]] = Field(default=None)
+    relationship_type: Optional[RelationshipTypeEnum] = Field(default=None)
 
     # -----------------------------
     # Geo Tagging
     # -----------------------------
-    geo_price: Optional[str] = field(default=None)
-    geo_availability: Optional[str] = field(default=None)
+    geo_price: Optional[str] = Field(default=None)
+    geo_availability: Optional[str] = Field(default=None)
 
     # -----------------------------
     # Validators
@@ -8,6 +8,8 @@ from orders.schemas import (
 )
 from pydantic import ValidationError
 
+from checkout.cache import CheckoutSessionCache
+
 
 # ---------------------------------------------------------------------
 # OrderService
@@ -21,6 +23,8 @@ class OrderService:
     - WebhookEvent -> OrderSocketMessage
     - Returns WebhookAcceptedResponse
     - Returns Error on failure
+    - Keeps a shared CheckoutSessionCache current, if given; pass
+      `Resources.session_cache` so CheckoutService sees the updates
     """
 
     def __init__(
@@ -28,9 +32,11 @@ class OrderService:
         *,
         webhook_verifier,
         websocket_hub,
+        session_cache: CheckoutSessionCache | None = None,
     ) -> None:
         self._verify_webhook = webhook_verifier
         self._sockets = websocket_hub
+        self._sessions = session_cache
 
     # ------------------------------------------------------------------
     # Webhook ingress
@@ -68,19 +74,23 @@ class OrderService:
                 param=None,
             )
 
-        # 3. Transform to websocket message
+        # 3. Update cached checkout session state
+        if self._sessions is not None:
+            self._sessions.apply_event(event)
+
+        # 4. Transform to websocket message
         socket_message = OrderSocketMessage(
             type="order.created" if event.type == "order_create" else "order.updated",
             data=event.data,
         )
 
-        # 4. Broadcast to websocket(s)
+        # 5. Broadcast to websocket(s)
         self._sockets.broadcast(
             channel=self._channel_for(event),
             message=socket_message.model_dump(mode="json"),
         )
 
-        # 5. Return acknowledgement
+        # 6. Return acknowledgement
         return WebhookAcceptedResponse(
             received=True,
             request_id=headers.get("Request-Id"),
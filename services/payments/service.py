@@ -4,6 +4,7 @@ from typing import Optional
 import httpx
 
 from payments.schemas import DelegatePaymentRequest, DelegatePaymentResponse, Error
+from libs.core.http import Timeout
 from services.base import BaseService
 
 API_VERSION = "2025-09-29"
@@ -81,20 +82,23 @@ class PaymentsService(BaseService):
         signature: Optional[str] = None,
         timestamp: Optional[str] = None,
         request_id: Optional[str] = None,
+        timeout: Timeout = None,
     ) -> DelegatePaymentResponse:
         """
         POST /agentic_commerce/delegate_payment
         """
         response = await self._handle_request(
-            self._http.post(
+            self._http.post_raw(
                 path=DELEGATE_PAYMENT_PATH,
-                json=request.model_dump(mode="json"),
+                endpoint="payments.delegate_payment",
+                content=self._json_body(request),
                 headers=self._headers(
                     idempotency_key=idempotency_key or self._new_idempotency_key(),
                     signature=signature,
                     timestamp=timestamp or self._now_rfc3339(),
                     request_id=request_id,
                 ),
+                timeout=timeout,
             )
         )
-        return DelegatePaymentResponse.model_validate(response)
+        return DelegatePaymentResponse.model_validate_json(response)
@@ -0,0 +1,194 @@
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+import types
+import typing
+from pathlib import Path
+from typing import Iterator
+
+from pydantic import ValidationError
+
+from libs.core.stores.base import BaseStore
+from services.models import Product
+from services.products.schemas import IngestReport
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+
+def _is_list(annotation) -> bool:
+    """Whether an annotation is a list, looking through Optional/Annotated."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return _is_list(typing.get_args(annotation)[0])
+    if origin in (typing.Union, types.UnionType):
+        return any(_is_list(arg) for arg in typing.get_args(annotation))
+    return origin is list
+
+
+# Product fields that hold lists; CSV feeds encode them as comma-separated values
+LIST_FIELDS = frozenset(
+    name for name, info in Product.model_fields.items() if _is_list(info.annotation)
+)
+
+# Metadata key holding the hashes delta sync compares against
+SYNC_FIELD = "_sync"
+
+
+def fingerprint(product: Product) -> dict:
+    """
+    Hash a product twice: over every field, and over just the embedded
+    text, so a sync can tell metadata-only changes from ones that need a
+    new embedding.
+    """
+    canonical = json.dumps(
+        product.model_dump(mode="json"), sort_keys=True, separators=(",", ":")
+    )
+    return {
+        "fingerprint": hashlib.sha256(canonical.encode("utf-8")).hexdigest(),
+        "text_hash": hashlib.sha256(product.description.encode("utf-8")).hexdigest(),
+    }
+
+
+def to_metadata(product: Product) -> dict:
+    return {**product.model_dump(mode="json"), SYNC_FIELD: fingerprint(product)}
+
+
+def read_feed(path: str, format: str) -> Iterator[dict]:
+    """Yield raw rows from a JSONL or CSV feed, gzip-compressed or not."""
+    with _open(path) as f:
+        if format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif format == "csv":
+            for row in csv.DictReader(f):
+                yield _normalize_csv_row(row)
+        else:
+            raise ValueError(f"Unsupported ingest format: {format}")
+
+
+def _open(path: str) -> io.TextIOBase:
+    with open(path, "rb") as f:
+        compressed = f.read(2) == GZIP_MAGIC
+    if compressed:
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _normalize_csv_row(row: dict) -> dict:
+    normalized = {}
+    for key, value in row.items():
+        if value is None or value == "":
+            continue
+        if key in LIST_FIELDS:
+            value = [item.strip() for item in value.split(",") if item.strip()]
+        normalized[key] = value
+    return normalized
+
+
+class CatalogIngestor:
+    """
+    Streams a product feed (JSONL or CSV, optionally gzip-compressed) into a
+    store in fixed-size chunks.
+
+    Each chunk is validated as `Product` rows, then handed to
+    `BaseStore.upsert_texts`, which batches embedding calls and writes.
+    After every committed chunk the number of consumed rows is recorded in a
+    checkpoint file, so a crashed run resumes where it stopped. The
+    checkpoint also records the feed's size and mtime; a feed replaced since
+    is ingested from the start.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore,
+        *,
+        chunk_size: int = 1000,
+        max_errors: int = 20,
+    ) -> None:
+        self.store = store
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+
+    async def ingest(
+        self,
+        path: str,
+        format: str,
+        *,
+        checkpoint_path: str | None = None,
+    ) -> IngestReport:
+        checkpoint = Path(checkpoint_path or f"{path}.checkpoint")
+        feed = self._feed_state(path)
+        start_row = self._load_checkpoint(checkpoint, feed)
+
+        report = IngestReport(path=path, resumed_from=start_row)
+        started = time.perf_counter()
+
+        row_number = start_row
+        for chunk in self._chunks(read_feed(path, format), start_row):
+            ids, texts, metadatas = [], [], []
+            for raw in chunk:
+                row_number += 1
+                try:
+                    product = Product.model_validate(raw)
+                except ValidationError as exc:
+                    report.rows_invalid += 1
+                    if len(report.errors) < self.max_errors:
+                        report.errors.append(f"row {row_number}: {exc}")
+                    continue
+                ids.append(product.id)
+                texts.append(product.description)
+                metadatas.append(to_metadata(product))
+
+            await self.store.upsert_texts(ids, texts, metadatas)
+
+            report.rows_read += len(chunk)
+            report.rows_written += len(ids)
+            report.embeddings += len(texts)
+            self._save_checkpoint(checkpoint, feed, row_number)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        checkpoint.unlink(missing_ok=True)
+        return report
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _chunks(self, rows: Iterator[dict], skip: int) -> Iterator[list[dict]]:
+        chunk = []
+        for index, row in enumerate(rows):
+            if index < skip:
+                continue
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    # ------------------------------------------------------------------
+
+    def _feed_state(self, path: str) -> dict:
+        stat = os.stat(path)
+        return {"path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_checkpoint(self, checkpoint: Path, feed: dict) -> int:
+        if not checkpoint.exists():
+            return 0
+        state = json.loads(checkpoint.read_text())
+        if any(state.get(key) != value for key, value in feed.items()):
+            return 0
+        return int(state.get("rows", 0))
+
+    def _save_checkpoint(self, checkpoint: Path, feed: dict, rows: int) -> None:
+        tmp = checkpoint.with_suffix(checkpoint.suffix + ".tmp")
+        tmp.write_text(json.dumps({**feed, "rows": rows}))
+        os.replace(tmp, checkpoint)
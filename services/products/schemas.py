@@ -1,10 +1,51 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, computed_field
+from typing import List, Optional
 
 from services.models import Product
 
 class ProductListResponse(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
     products: List[Product]
+    next_cursor: Optional[str] = None
+
+
+class IngestReport(BaseModel):
+    path: str
+    resumed_from: int = 0
+    rows_read: int = 0
+    rows_written: int = 0
+    rows_invalid: int = 0
+    embeddings: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[str] = []
+
+    @computed_field
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @computed_field
+    @property
+    def embeddings_per_second(self) -> float:
+        return self.embeddings / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+
+class DeltaSyncReport(BaseModel):
+    path: str
+    rows_read: int = 0
+    rows_invalid: int = 0
+    inserted: int = 0
+    reembedded: int = 0
+    metadata_updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    deletions_withheld: int = 0
+    elapsed_seconds: float = 0.0
+    errors: List[str] = []
+
+    @computed_field
+    @property
+    def embeddings(self) -> int:
+        return self.inserted + self.reembedded
@@ -1,25 +1,52 @@
-from libs.core.factory import create_store
+from typing import AsyncIterator
+
+from libs.core.factory import get_resources
 from libs.core.settings import PegasusSettings
 from services.models import Product
-from services.products.schemas import ProductListResponse
+from services.products.ingest import CatalogIngestor
+from services.products.schemas import (
+    DeltaSyncReport,
+    IngestReport,
+    ProductListResponse,
+)
+from services.products.sync import CatalogDeltaSync
+
+PRODUCT_FIELDS = list(Product.model_fields)
 
 
 class ProductsService:
     def __init__(self, settings: PegasusSettings) -> None:
-        self.store = create_store(settings)
+        self.store = get_resources(settings).store
 
     def get_product_by_id(self, product_id: str) -> Product:
         pass
 
-    def get_products(self) -> ProductListResponse:
-        records = self.store.query(filters=None)
+    async def get_products(
+        self, page_size: int = 20, cursor: str | None = None
+    ) -> ProductListResponse:
+        """
+        Return one page of products. Pass the previous page's `next_cursor`
+        to continue; `next_cursor` is None on the last page.
+        """
+        records = await self.store.query(
+            filters=None, limit=page_size, after=cursor, projection=PRODUCT_FIELDS
+        )
+
+        products = [self._to_product(record) for record in records]
+        next_cursor = (
+            str(records[-1]["_id"]) if len(records) == page_size else None
+        )
 
-        products = [
-            Product.model_validate(product)
-            for idx, product in enumerate(list(records))
-        ]
+        return ProductListResponse(
+            page_size=page_size, products=products, next_cursor=next_cursor
+        )
 
-        return products
+    async def export_products(self, batch_size: int = 500) -> AsyncIterator[Product]:
+        """Stream the whole catalog in constant memory."""
+        async for record in self.store.iter_query(
+            batch_size=batch_size, projection=PRODUCT_FIELDS
+        ):
+            yield self._to_product(record)
 
     def create_product(self, product: Product) -> None:
         pass
@@ -27,8 +54,49 @@ class ProductsService:
     def update_product(self, product_id: str, product: Product) -> None:
         pass
 
-    def ingest_products(self, path: str, format: str) -> None:
-        pass
+    async def ingest_products(
+        self,
+        path: str,
+        format: str,
+        *,
+        chunk_size: int = 1000,
+        checkpoint_path: str | None = None,
+    ) -> IngestReport:
+        ingestor = CatalogIngestor(self.store, chunk_size=chunk_size)
+        return await ingestor.ingest(path, format, checkpoint_path=checkpoint_path)
+
+    async def sync_products(
+        self,
+        path: str,
+        format: str,
+        *,
+        scope: dict | None = None,
+        delete_missing: bool = True,
+        chunk_size: int = 1000,
+        max_delete_ratio: float = 0.2,
+        force: bool = False,
+    ) -> DeltaSyncReport:
+        """
+        Apply a full feed as a delta: only new products and changed
+        descriptions are embedded, metadata-only changes are patched in
+        place, and products missing from the feed are deleted unless the
+        feed looks truncated (see `CatalogDeltaSync`).
+        """
+        syncer = CatalogDeltaSync(
+            self.store, chunk_size=chunk_size, max_delete_ratio=max_delete_ratio
+        )
+        return await syncer.sync(
+            path, format, scope=scope, delete_missing=delete_missing, force=force
+        )
 
     def delete_product(self, product_id: str) -> None:
         pass
+
+    def _to_product(self, record: dict) -> Product:
+        # Drop the store's own bookkeeping fields before validating
+        fields = {
+            k: v
+            for k, v in record.items()
+            if not k.startswith("_") and k not in ("text", "embedding")
+        }
+        return Product.model_validate(fields)
@@ -0,0 +1,130 @@
+import time
+
+from pydantic import ValidationError
+
+from libs.core.stores.base import BaseStore
+from services.models import Product
+from services.products.ingest import SYNC_FIELD, fingerprint, read_feed, to_metadata
+from services.products.schemas import DeltaSyncReport
+
+
+class CatalogDeltaSync:
+    """
+    Applies a full product feed to a store as a delta.
+
+    Existing `_sync` fingerprints are loaded once with a projected scan.
+    Each feed row is then classified as:
+
+    - inserted: the id is not in the store (embedded and written)
+    - re-embedded: the embedded text changed (embedded and written)
+    - metadata-only: other fields changed (`$set`, no embedding call)
+    - unchanged: skipped
+
+    Ids in the store but absent from the feed are deleted. `scope` limits
+    both the comparison and the deletions, e.g. to one merchant's products.
+    A feed that is empty, or would delete more than `max_delete_ratio` of
+    the scope, is treated as truncated: nothing is deleted unless the
+    caller passes `force=True`, and the report counts the withheld ids.
+    """
+
+    def __init__(
+        self,
+        store: BaseStore,
+        *,
+        chunk_size: int = 1000,
+        max_errors: int = 20,
+        max_delete_ratio: float = 0.2,
+    ) -> None:
+        self.store = store
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.max_delete_ratio = max_delete_ratio
+
+    async def sync(
+        self,
+        path: str,
+        format: str,
+        *,
+        scope: dict | None = None,
+        delete_missing: bool = True,
+        force: bool = False,
+    ) -> DeltaSyncReport:
+        report = DeltaSyncReport(path=path)
+        started = time.perf_counter()
+
+        existing = {
+            record["_id"]: record.get(SYNC_FIELD) or {}
+            async for record in self.store.iter_query(
+                filters=scope, projection=[SYNC_FIELD]
+            )
+        }
+        seen: set[str] = set()
+
+        embed: dict[str, tuple[str, dict]] = {}
+        updates: dict[str, dict] = {}
+
+        for row_number, raw in enumerate(read_feed(path, format), start=1):
+            report.rows_read += 1
+            # Counted as seen even when invalid: a bad row must not delete
+            # the product it was meant to update
+            if raw.get("id") is not None:
+                seen.add(str(raw["id"]))
+            try:
+                product = Product.model_validate(raw)
+            except ValidationError as exc:
+                report.rows_invalid += 1
+                if len(report.errors) < self.max_errors:
+                    report.errors.append(f"row {row_number}: {exc}")
+                continue
+
+            previous = existing.get(product.id)
+            current = fingerprint(product)
+
+            if previous is None:
+                report.inserted += 1
+                embed[product.id] = (product.description, to_metadata(product))
+            elif previous.get("text_hash") != current["text_hash"]:
+                report.reembedded += 1
+                embed[product.id] = (product.description, to_metadata(product))
+            elif previous.get("fingerprint") != current["fingerprint"]:
+                report.metadata_updated += 1
+                updates[product.id] = to_metadata(product)
+            else:
+                report.unchanged += 1
+
+            if len(embed) >= self.chunk_size:
+                await self._flush_embeds(embed)
+            if len(updates) >= self.chunk_size:
+                await self._flush_updates(updates)
+
+        await self._flush_embeds(embed)
+        await self._flush_updates(updates)
+
+        if delete_missing:
+            missing = [id for id in existing if id not in seen]
+            truncated = report.rows_read == 0 or (
+                len(missing) > self.max_delete_ratio * len(existing)
+            )
+            if missing and truncated and not force:
+                report.deletions_withheld = len(missing)
+                report.errors.append(
+                    f"refused to delete {len(missing)} of {len(existing)} products;"
+                    " the feed looks truncated (pass force=True to delete)"
+                )
+            else:
+                await self.store.delete_many(missing)
+                report.deleted = len(missing)
+
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    async def _flush_embeds(self, embed: dict[str, tuple[str, dict]]) -> None:
+        ids = list(embed)
+        texts = [embed[id][0] for id in ids]
+        metadatas = [embed[id][1] for id in ids]
+        await self.store.upsert_texts(ids, texts, metadatas)
+        embed.clear()
+
+    async def _flush_updates(self, updates: dict[str, dict]) -> None:
+        await self.store.update_metadata(dict(updates))
+        updates.clear()
@@ -0,0 +1,204 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from langchain.messages import ToolMessage
+from langchain_core.embeddings import Embeddings
+
+from libs.core.stores.base import BaseStore
+from libs.core.stores.cache import normalize_query
+from responses.tools import find_products, products_digest
+
+
+@dataclass
+class SemanticCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    expirations: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Entry:
+    result: Any
+    searches: list[dict]
+    expires_at: float
+
+
+class SemanticResponseCache:
+    """
+    Reuses agent answers for near-duplicate questions.
+
+    Queries are normalized and embedded; a lookup returns the answer of the
+    most similar cached query if its cosine similarity reaches `threshold`.
+    Before a hit is served, every product search that answer relied on is
+    replayed against the store and compared by digest, so catalog updates
+    (price, stock, new or removed products) turn the entry stale and it is
+    dropped. Replayed searches normally come from the store's own result
+    cache, which is far cheaper than another agent run.
+
+    Query vectors live in one preallocated matrix, one row per entry, so
+    inserts and removals touch a single row and a lookup is a single
+    matrix-vector product.
+
+    Any write to the store bumps its `generation`; the next lookup or insert
+    then calls `invalidate()`, so answers never outlive a catalog change.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        store: BaseStore,
+        *,
+        threshold: float = 0.95,
+        ttl_seconds: float = 900.0,
+        max_entries: int = 2000,
+    ) -> None:
+        self.embeddings = embeddings
+        self.store = store
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = SemanticCacheStats()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._generation = store.generation
+        self._rows: dict[str, int] = {}
+        self._keys: list[str | None] = []
+        self._free: list[int] = []
+        self._matrix: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, query: str) -> Any | None:
+        self._check_generation()
+        key = normalize_query(query)
+        entry = self._entries.get(key)
+        if entry is None and self._entries:
+            vector = await self._embed(key)
+            key = self._nearest(vector)
+            entry = self._entries.get(key) if key else None
+
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        if not await self._still_valid(entry):
+            self._remove(key)
+            self.stats.stale += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.result
+
+    async def set(self, query: str, result: Any) -> None:
+        self._check_generation()
+        key = normalize_query(query)
+        vector = await self._embed(key)
+        self._entries[key] = _Entry(
+            result=result,
+            searches=self._searches(result),
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        self._index(key, vector)
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._unindex(evicted)
+            self.stats.evictions += 1
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self._rows.clear()
+        self._keys.clear()
+        self._free.clear()
+        self._matrix = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _check_generation(self) -> None:
+        if self.store.generation != self._generation:
+            self._generation = self.store.generation
+            self.invalidate()
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(await self.embeddings.aembed_query(text), dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def _nearest(self, vector: np.ndarray) -> str | None:
+        if not self._rows:
+            return None
+        size = len(self._keys)
+        similarities = self._matrix[:size] @ vector
+        # Freed rows are zeroed, so they never reach a positive threshold
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._keys[best]
+
+    def _index(self, key: str, vector: np.ndarray) -> None:
+        row = self._rows.get(key)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self._keys[row] = key
+            else:
+                row = len(self._keys)
+                self._keys.append(key)
+            self._rows[key] = row
+
+        if self._matrix is None or row >= len(self._matrix):
+            current = 0 if self._matrix is None else len(self._matrix)
+            capacity = max(row + 1, 2 * current, 64)
+            matrix = np.zeros((capacity, len(vector)), dtype=np.float32)
+            if current:
+                matrix[:current] = self._matrix
+            self._matrix = matrix
+        self._matrix[row] = vector
+
+    def _unindex(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is not None:
+            self._matrix[row] = 0
+            self._keys[row] = None
+            self._free.append(row)
+
+    def _remove(self, key: str) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._unindex(key)
+
+    def _searches(self, result: Any) -> list[dict]:
+        return [
+            message.artifact["search"]
+            for message in result["messages"]
+            if isinstance(message, ToolMessage)
+            and isinstance(message.artifact, dict)
+            and "search" in message.artifact
+        ]
+
+    async def _still_valid(self, entry: _Entry) -> bool:
+        for search in entry.searches:
+            products = await find_products(
+                self.store, search["input"], search["filters"]
+            )
+            if products_digest(products) != search["digest"]:
+                return False
+        return True
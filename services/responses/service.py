@@ -1,13 +1,61 @@
+from typing import AsyncIterator
+
+from libs.core.agent import AgentEvent
 from libs.core.context import AgentContext
-from libs.core.factory import create_agent_graph, create_store
+from libs.core.factory import create_agent_graph, get_resources
 from libs.core.settings import PegasusSettings
+from responses.cache import SemanticResponseCache
 from responses.tools import tools
 
 
 class ResponsesService:
     def __init__(self, settings: PegasusSettings):
-        self.agent = create_agent_graph(settings, tools)
-        self.context = AgentContext(create_store(settings))
+        resources = get_resources(settings)
+        self.agent = create_agent_graph(
+            settings, tools, model=resources.llm, checkpointer=resources.checkpointer
+        )
+        self.context = AgentContext(
+            resources.store, tool_output=settings.agent.tool_output
+        )
+
+        self.cache = None
+        cache = settings.agent.response_cache
+        if cache and cache.enabled:
+            self.cache = SemanticResponseCache(
+                resources.embeddings,
+                resources.store,
+                threshold=cache.similarity_threshold,
+                ttl_seconds=cache.ttl_seconds,
+                max_entries=cache.max_entries,
+            )
+
+    async def respond(self, input: str, conversation_id: str | None = None):
+        """
+        Answer `input`, continuing the conversation `conversation_id` when
+        conversation state is configured.
+
+        Standalone questions (no `conversation_id`) go through the semantic
+        response cache; turns of a conversation depend on its history and
+        always run the agent.
+        """
+        use_cache = self.cache is not None and conversation_id is None
+        if use_cache and (cached := await self.cache.get(input)) is not None:
+            return cached
+
+        result = await self.agent.arun(
+            input=input, context=self.context, thread_id=conversation_id
+        )
+
+        # Answers cut short by a run budget are not worth repeating
+        if use_cache and not result.get("limit_reached"):
+            await self.cache.set(input, result)
+        return result
 
-    def respond(self, input: str):
-        return self.agent.run(input=input, context=self.context)
+    async def respond_stream(
+        self, input: str, conversation_id: str | None = None
+    ) -> AsyncIterator[AgentEvent]:
+        """Stream model tokens and completed agent steps as they happen."""
+        async for event in self.agent.astream(
+            input=input, context=self.context, thread_id=conversation_id
+        ):
+            yield event
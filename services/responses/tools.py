@@ -1,72 +1,171 @@
-from collections import defaultdict
+import hashlib
 import json
-from typing import List
+from typing import List, Optional
 from langchain.tools import tool, ToolRuntime
+from pydantic import TypeAdapter
 
 from libs.core.context import AgentContext
-from services.models import Product, ProductDocument
+from libs.core.settings import ToolOutputSettings
+from libs.core.stores.base import BaseStore
+from services.models import ProductDocument
 from services.responses.schemas import ProductCard, ProductVariant
 
+# Metadata needed to build cards; the description comes from the document text
+SEARCH_PROJECTION = sorted(
+    (set(ProductCard.model_fields) | set(ProductVariant.model_fields))
+    - {"variants", "description", "q_and_a", "raw_review_data"}
+)
+
+# Applied to every search so hidden and unavailable products never take a slot
+DEFAULT_SEARCH_FILTERS = {
+    "enable_search": "true",
+    "availability": ["in_stock", "preorder"],
+}
+
+# Precomputed once so grouping is a single dict partition per document
+_VARIANT_FIELDS = tuple(ProductVariant.model_fields)
+_CARD_FIELDS = tuple(
+    f
+    for f in ProductCard.model_fields
+    if f not in ProductVariant.model_fields and f not in {"description", "variants"}
+)
+_CARDS = TypeAdapter(List[ProductCard])
+
 
 @tool(response_format="content_and_artifact")
-def search_products(input: str, runtime: ToolRuntime[AgentContext]):
+async def search_products(
+    input: str,
+    runtime: ToolRuntime[AgentContext],
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+):
     """
     Retrieves a list of products from the products collection by the product description
 
+    Args:
+        input: Description of the product the user is looking for.
+        category: Exact product category to restrict results to, if known.
+        brand: Exact brand name to restrict results to, if known.
+
     Returns:
-        A dictionary containing the list of products if found.
+        A compact JSON list of matching products, grouped with their variants.
     """
 
-    documents = runtime.context.store.hybrid_search(input)
+    filters = dict(DEFAULT_SEARCH_FILTERS)
+    if category:
+        filters["product_category"] = category
+    if brand:
+        filters["brand"] = brand
+
+    products = await find_products(runtime.context.store, input, filters)
+    content = cards_to_llm_view(products, runtime.context.tool_output)
+
+    # What the cards would have cost as pretty-printed JSON vs. what was sent
+    full_tokens = estimate_tokens(json.dumps(products, indent=2))
+    llm_tokens = estimate_tokens(content)
+    stats = runtime.context.tool_stats
+    stats.calls += 1
+    stats.full_tokens += full_tokens
+    stats.llm_tokens += llm_tokens
+
+    return content, {
+        "products": products,
+        # Lets a cached answer be checked later by replaying the search
+        "search": {
+            "input": input,
+            "filters": filters,
+            "digest": products_digest(products),
+        },
+        "usage": {
+            "full_tokens": full_tokens,
+            "llm_tokens": llm_tokens,
+            "tokens_saved": full_tokens - llm_tokens,
+        },
+    }
+
+
+async def find_products(store: BaseStore, input: str, filters: dict) -> List[dict]:
+    documents = await store.hybrid_search(
+        input, filters=filters, projection=SEARCH_PROJECTION
+    )
+    return documents_to_grouped_cards(documents)
+
 
-    print(len(documents))
+def products_digest(products: List[dict]) -> str:
+    """Stable hash of a search result, to tell whether it has changed."""
+    payload = json.dumps(products, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    products = documents_to_grouped_cards(documents)
 
-    return {"products": products}
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for provider-agnostic reporting."""
+    return (len(text) + 3) // 4
 
 
-def documents_to_grouped_cards(docs: List[ProductDocument]) -> str:
+def cards_to_llm_view(cards: List[dict], settings: ToolOutputSettings) -> str:
     """
-    Convert a list of ProductDocument objects into grouped ProductCard objects
-    and serialize the result as a JSON string.
+    Render cards for the model: whitelisted fields only, nulls and empty
+    values dropped, long strings truncated and minified JSON.
     """
-    grouped: dict[str, dict] = defaultdict(
-        lambda: {"variants": [], "card_fields": None}
-    )
+    view = []
+    for card in cards:
+        compact = _compact(card, settings.card_fields, settings.max_text_length)
+        variants = [
+            _compact(variant, settings.variant_fields, settings.max_text_length)
+            for variant in card.get("variants", [])
+        ]
+        if variants := [variant for variant in variants if variant]:
+            compact["variants"] = variants
+        view.append(compact)
+    return json.dumps(view, separators=(",", ":"), ensure_ascii=False)
+
+
+def _compact(data: dict, fields: List[str], max_text_length: int) -> dict:
+    compact = {}
+    for name in fields:
+        value = data.get(name)
+        if value is None or value == "" or value == []:
+            continue
+        if isinstance(value, str) and len(value) > max_text_length:
+            value = value[:max_text_length].rstrip() + "…"
+        compact[name] = value
+    return compact
+
+
+def documents_to_grouped_cards(
+    docs: List[ProductDocument], validate: bool = False
+) -> List[dict]:
+    """
+    Group documents into product cards (one per item group, each row a
+    variant) and return them as JSON-compatible dicts.
+
+    Metadata read back from our own store was validated on ingest, so by
+    default each dict is partitioned once into card and variant fields
+    without building models. Pass `validate=True` for documents from an
+    untrusted source to check the cards with a single batched validation.
+    """
+    grouped: dict[str, dict] = {}
 
     for doc in docs:
-        # Convert metadata to typed Product
-        product = Product.model_validate(doc.metadata)
-        product.description = doc.page_content
-
-        # Determine group ID
-        group_id = product.item_group_id or product.id
-
-        # Create variant using Pydantic v2 model_fields
-        variant_fields = ProductVariant.model_fields
-        variant = ProductVariant(
-            **{f: getattr(product, f) for f in variant_fields if hasattr(product, f)}
-        )
-
-        grouped[group_id]["variants"].append(variant)
-
-        # Card-level fields (everything not in variant)
-        if grouped[group_id]["card_fields"] is None:
-            product_dict = product.model_dump()
-            for f in variant_fields:
-                product_dict.pop(f, None)
-            grouped[group_id]["card_fields"] = product_dict
-
-    # Build ProductCard objects
-    product_cards = []
-    for group_id, data in grouped.items():
-        card_data = data["card_fields"]
-        card_data["variants"] = data["variants"]
-        product_cards.append(ProductCard(**card_data))
-
-    # Serialize the list of ProductCards to JSON
-    return json.dumps([card.model_dump() for card in product_cards], indent=2)
+        metadata = doc.metadata
+        group_id = metadata.get("item_group_id") or metadata["id"]
+
+        variant = {f: metadata[f] for f in _VARIANT_FIELDS if f in metadata}
+        # Each feed row is one purchasable variant, identified by its id
+        variant.setdefault("sku", metadata["id"])
+
+        card = grouped.get(group_id)
+        if card is None:
+            card = {f: metadata[f] for f in _CARD_FIELDS if f in metadata}
+            card["description"] = doc.page_content
+            card["variants"] = []
+            grouped[group_id] = card
+        card["variants"].append(variant)
+
+    cards = list(grouped.values())
+    if validate:
+        cards = _CARDS.dump_python(_CARDS.validate_python(cards), mode="json")
+    return cards
 
 
 tools = [search_products]
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langgraph.checkpoint.memory import InMemorySaver
+
+from libs.core.agent import Agent
+from libs.core.budget import RunBudgetMiddleware
+
+
+def make_agent(replies, checkpointer=None, streaming=True) -> Agent:
+    model = GenericFakeChatModel(
+        messages=iter(replies), disable_streaming=not streaming
+    )
+    return Agent(
+        create_agent(
+            model,
+            tools=[],
+            middleware=[RunBudgetMiddleware(max_iterations=3)],
+            checkpointer=checkpointer,
+        )
+    )
+
+
+def collect(agent: Agent, input: str) -> list:
+    async def run():
+        return [event async for event in agent.astream(input, context=None)]
+
+    return asyncio.run(run())
+
+
+def test_runs_without_a_thread_are_not_checkpointed():
+    saver = InMemorySaver()
+    agent = make_agent(["one", "two"], checkpointer=saver)
+
+    async def run():
+        await agent.arun("standalone", context=None)
+        await agent.arun("in a thread", context=None, thread_id="t1")
+
+    asyncio.run(run())
+
+    assert list(saver.storage) == ["t1"]
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_stream_yields_answer_text_and_only_agent_steps(streaming):
+    events = collect(make_agent(["hello there"], streaming=streaming), "hi")
+
+    text = "".join(event.data for event in events if event.type == "token")
+    assert text == "hello there"
+    assert [event.node for event in events if event.type == "step"] == ["model"]
@@ -0,0 +1,119 @@
+import asyncio
+import itertools
+import time
+
+from langchain.agents import create_agent
+from langchain.messages import AIMessage
+from langchain.tools import tool
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+
+from libs.core.budget import TOOL_TIMEOUT_MESSAGE, RunBudgetMiddleware
+
+
+class ToolHungryModel(GenericFakeChatModel):
+    """Asks for another search on every call, wrap-up prompt or not."""
+
+    calls: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def _generate(self, *args, **kwargs):
+        self.calls += 1
+        return super()._generate(*args, **kwargs)
+
+
+class SlowFirstCallModel(GenericFakeChatModel):
+    """Takes far longer than any deadline on its first call only."""
+
+    calls: int = 0
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    async def _agenerate(self, *args, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            await asyncio.sleep(10)
+        return await super()._agenerate(*args, **kwargs)
+
+
+@tool
+def search(query: str) -> str:
+    """Search the catalog."""
+    return "nothing found"
+
+
+@tool
+async def slow_search(query: str) -> str:
+    """Search the catalog, slowly."""
+    await asyncio.sleep(10)
+    return "nothing found"
+
+
+def test_run_ends_after_wrap_up_call_when_model_ignores_it():
+    model = ToolHungryModel(
+        messages=(
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "search", "args": {"query": "x"}, "id": f"call-{i}"}],
+            )
+            for i in itertools.count()
+        )
+    )
+    agent = create_agent(
+        model, tools=[search], middleware=[RunBudgetMiddleware(max_iterations=3)]
+    )
+
+    result = agent.invoke({"messages": [{"role": "user", "content": "find x"}]})
+
+    assert model.calls == 4
+    assert result["limit_reached"] == "iterations"
+    assert result["messages"][-1].tool_calls == []
+
+
+def test_deadline_cancels_a_running_tool():
+    model = ToolHungryModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "slow_search", "args": {"query": "x"}, "id": "call-0"}
+                    ],
+                ),
+                AIMessage(content="Nothing yet."),
+            ]
+        )
+    )
+    agent = create_agent(
+        model,
+        tools=[slow_search],
+        middleware=[RunBudgetMiddleware(deadline_seconds=0.2)],
+    )
+
+    started = time.monotonic()
+    result = asyncio.run(
+        agent.ainvoke({"messages": [{"role": "user", "content": "find x"}]})
+    )
+
+    assert time.monotonic() - started < 5
+    assert result["messages"][2].content == TOOL_TIMEOUT_MESSAGE
+    assert result["limit_reached"] == "deadline"
+    assert result["messages"][-1].content == "Nothing yet."
+
+
+def test_deadline_replaces_an_overrunning_model_call_with_the_wrap_up():
+    model = SlowFirstCallModel(messages=iter([AIMessage(content="Short answer.")]))
+    agent = create_agent(
+        model, tools=[search], middleware=[RunBudgetMiddleware(deadline_seconds=0.2)]
+    )
+
+    started = time.monotonic()
+    result = asyncio.run(
+        agent.ainvoke({"messages": [{"role": "user", "content": "find x"}]})
+    )
+
+    assert time.monotonic() - started < 5
+    assert model.calls == 2
+    assert result["messages"][-1].content == "Short answer."
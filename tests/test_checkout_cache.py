@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from checkout.service import CheckoutService
+from libs.core import factory
+from libs.core.settings import PegasusSettings
+from orders.service import OrderService
+
+SESSION = {
+    "id": "cs_1",
+    "status": "ready_for_payment",
+    "currency": "usd",
+    "line_items": [],
+    "fulfillment_options": [],
+    "totals": [],
+    "messages": [],
+    "links": [],
+}
+
+ORDER_CREATE = {
+    "type": "order_create",
+    "data": {
+        "type": "order",
+        "checkout_session_id": "cs_1",
+        "permalink_url": "https://merchant.example/orders/1",
+        "status": "created",
+        "refunds": [],
+    },
+}
+
+
+class Hub:
+    def broadcast(self, *, channel, message):
+        pass
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    monkeypatch.setattr(factory, "_resources", None)
+    return PegasusSettings.model_validate(
+        {
+            "store": {"provider": "memory"},
+            "agent": {"llm": {"provider": "openai"}, "prompt": ""},
+            "merchant_api": {
+                "base_url": "http://merchant",
+                "oauth": {
+                    "client_id": "c",
+                    "client_secret": "s",
+                    "token_url": "http://merchant/token",
+                    "scope": "checkout",
+                },
+                "session_cache": {"max_age_seconds": 60},
+            },
+        }
+    )
+
+
+def test_webhook_through_order_service_reaches_checkout_polls(settings):
+    resources = factory.get_resources(settings)
+    fetches = []
+
+    def route(request):
+        if request.url.path == "/token":
+            return httpx.Response(
+                200, json={"access_token": "t", "token_type": "Bearer", "expires_in": 3600}
+            )
+        fetches.append(request.url.path)
+        return httpx.Response(200, json=SESSION)
+
+    resources.http._client._transport = httpx.MockTransport(route)
+
+    checkout = CheckoutService(settings)
+    orders = OrderService(
+        webhook_verifier=lambda body, headers: None,
+        websocket_hub=Hub(),
+        session_cache=resources.session_cache,
+    )
+
+    async def run():
+        assert (await checkout.get_session("cs_1")).status == "ready_for_payment"
+        orders.handle_webhook(raw_body=json.dumps(ORDER_CREATE).encode(), headers={})
+        return await checkout.get_session("cs_1")
+
+    assert asyncio.run(run()).status == "completed"
+    assert len(fetches) == 1
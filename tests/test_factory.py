@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from libs.core import factory
+from libs.core.embeddings.cache import CachedEmbeddings
+from libs.core.settings import PegasusSettings
+from libs.providers.embeddings import hashing  # noqa: F401  registers "hashing"
+
+
+def make_settings(**store) -> PegasusSettings:
+    return PegasusSettings.model_validate(
+        {
+            "store": {"provider": "memory", **store},
+            "agent": {"llm": {"provider": "openai"}, "prompt": ""},
+            "merchant_api": {
+                "base_url": "http://merchant",
+                "oauth": {
+                    "client_id": "c",
+                    "client_secret": "s",
+                    "token_url": "http://merchant/token",
+                    "scope": "checkout",
+                },
+            },
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def fresh_resources(monkeypatch):
+    monkeypatch.setattr(factory, "_resources", None)
+
+
+def test_get_resources_rejects_different_settings():
+    settings = make_settings()
+    assert factory.get_resources(make_settings()) is factory.get_resources(settings)
+
+    with pytest.raises(ValueError):
+        factory.get_resources(make_settings(memory={"index": "ivf"}))
+
+
+def test_shutdown_closes_the_embeddings_cache(tmp_path):
+    settings = make_settings(
+        embeddings={
+            "provider": "hashing",
+            "dimensions": 8,
+            "cache": {"path": str(tmp_path / "embeddings.db")},
+        }
+    )
+    resources = factory.get_resources(settings)
+    embeddings = resources.embeddings
+    assert isinstance(embeddings, CachedEmbeddings)
+
+    asyncio.run(resources.shutdown())
+
+    with pytest.raises(Exception, match="closed"):
+        embeddings.embed_query("shoes")
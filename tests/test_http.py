@@ -0,0 +1,78 @@
+import asyncio
+import itertools
+
+import httpx
+
+from libs.core.http import HttpClient
+from libs.core.settings import (
+    CircuitBreakerSettings,
+    MerchantAPISettings,
+    OAuthSettings,
+    RetrySettings,
+)
+
+_scopes = itertools.count()
+
+
+def make_client(handler, *, expires_in: int = 3600, **settings) -> HttpClient:
+    # A distinct scope per client keeps tokens out of the process-wide cache
+    oauth = OAuthSettings(
+        client_id="c",
+        client_secret="s",
+        token_url="http://m/token",
+        scope=str(next(_scopes)),
+    )
+    client = HttpClient(MerchantAPISettings(base_url="http://m", oauth=oauth, **settings))
+
+    def route(request):
+        if request.url.path == "/token":
+            return httpx.Response(
+                200,
+                json={"access_token": "t", "token_type": "Bearer", "expires_in": expires_in},
+            )
+        return handler(request)
+
+    client._client._transport = httpx.MockTransport(route)
+    return client
+
+
+def test_cancelled_half_open_probe_frees_the_circuit():
+    async def run():
+        release = asyncio.Event()
+        statuses = [503]
+
+        async def handler(request):
+            if statuses:
+                return httpx.Response(statuses.pop())
+            await release.wait()
+            return httpx.Response(200, json={})
+
+        client = make_client(
+            handler,
+            retry=RetrySettings(max_attempts=1),
+            circuit_breaker=CircuitBreakerSettings(failure_threshold=1, reset_timeout=0),
+        )
+        try:
+            await client.get("/x", endpoint="x")
+        except httpx.HTTPStatusError:
+            pass
+        assert client.circuit_stats()["x"].state in ("open", "half_open")
+
+        probe = asyncio.create_task(client.get("/x", endpoint="x"))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        release.set()
+        assert await client.get("/x", endpoint="x") == {}
+        assert client.circuit_stats()["x"].state == "closed"
+
+    asyncio.run(run())
+
+
+def test_token_inside_authlib_leeway_is_still_used():
+    async def run():
+        client = make_client(lambda request: httpx.Response(200, json={}), expires_in=30)
+        assert await client.get("/x") == {}
+
+    asyncio.run(run())
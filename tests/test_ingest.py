@@ -0,0 +1,56 @@
+import asyncio
+import json
+from typing import Annotated, List, Optional
+
+from pydantic import BaseModel, Field
+
+from services.products import ingest
+
+
+class FeedProduct(BaseModel):
+    id: str
+    description: str
+
+
+class CountingStore:
+    def __init__(self) -> None:
+        self.ids: list[str] = []
+
+    async def upsert_texts(self, ids, texts, metadatas):
+        self.ids.extend(ids)
+
+
+def test_list_fields_include_plain_and_optional_lists():
+    assert ingest._is_list(List[str])
+    assert ingest._is_list(list[int])
+    assert ingest._is_list(Optional[List[str]])
+    assert ingest._is_list(Annotated[List[str], Field(max_length=3)] | None)
+    assert not ingest._is_list(Optional[str])
+
+
+def test_checkpoint_is_ignored_once_the_feed_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, "Product", FeedProduct)
+    feed = tmp_path / "feed.jsonl"
+    rows = [{"id": f"p{i}", "description": f"d{i}"} for i in range(3)]
+    feed.write_text("\n".join(json.dumps(row) for row in rows))
+
+    ingestor = ingest.CatalogIngestor(CountingStore())
+    checkpoint = tmp_path / "feed.checkpoint"
+    ingestor._save_checkpoint(checkpoint, ingestor._feed_state(str(feed)), 2)
+    report = asyncio.run(
+        ingestor.ingest(str(feed), "jsonl", checkpoint_path=str(checkpoint))
+    )
+    assert report.resumed_from == 2
+
+    stale = ingestor._feed_state(str(feed))
+    rows.append({"id": "p3", "description": "d3"})
+    feed.write_text("\n".join(json.dumps(row) for row in rows))
+    ingestor._save_checkpoint(checkpoint, stale, 2)
+    store = CountingStore()
+    report = asyncio.run(
+        ingest.CatalogIngestor(store).ingest(
+            str(feed), "jsonl", checkpoint_path=str(checkpoint)
+        )
+    )
+    assert report.resumed_from == 0
+    assert store.ids == ["p0", "p1", "p2", "p3"]
@@ -0,0 +1,65 @@
+import asyncio
+
+import numpy as np
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from libs.providers.stores.memory import MemoryStore
+
+
+def test_filters_follow_writes_updates_and_deletes():
+    store = MemoryStore(DeterministicFakeEmbedding(size=8))
+
+    async def run():
+        await store.upsert_texts(
+            ["a", "b", "c"],
+            ["red shoe", "blue shoe", "red hat"],
+            [{"color": "red"}, {"color": "blue"}, {"color": "red", "size": "m"}],
+        )
+
+        async def matching(filters):
+            docs = await store.similarity_search("shoe", k=10, filters=filters)
+            return sorted(doc.id for doc in docs)
+
+        assert await matching({"color": "red"}) == ["a", "c"]
+        assert await matching({"color": ["red", "blue"], "size": "m"}) == ["c"]
+
+        await store.update_metadata({"b": {"color": "red"}})
+        await store.delete("a")
+        await store.upsert_texts(["d"], ["green shoe"], [{"color": "green"}])
+
+        assert await matching({"color": "red"}) == ["b", "c"]
+        assert await matching({"color": "green"}) == ["d"]
+        assert await matching({"color": "purple"}) == []
+
+    asyncio.run(run())
+
+
+def test_quantized_index_keeps_float_rows_off_the_heap():
+    store = MemoryStore(DeterministicFakeEmbedding(size=8), quantization="int8")
+    ids = [f"p{i}" for i in range(100)]
+
+    async def run():
+        await store.upsert_texts(ids, [f"product {i}" for i in range(100)], [{}] * 100)
+        return await store.similarity_search("product 42", k=1)
+
+    docs = asyncio.run(run())
+
+    assert isinstance(store._vectors.vectors, np.memmap)
+    assert [doc.id for doc in docs] == ["p42"]
+
+
+def test_every_write_bumps_the_generation():
+    store = MemoryStore(DeterministicFakeEmbedding(size=8))
+    generations = [store.generation]
+
+    async def run():
+        await store.upsert_texts(["a"], ["red shoe"], [{"color": "red"}])
+        generations.append(store.generation)
+        await store.update_metadata({"a": {"color": "blue"}})
+        generations.append(store.generation)
+        await store.delete("a")
+        generations.append(store.generation)
+
+    asyncio.run(run())
+
+    assert generations == sorted(set(generations))
@@ -0,0 +1,136 @@
+import asyncio
+
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from libs.providers.stores.mongodb import (
+    MongoDBStore,
+    search_index_definition,
+    vector_index_definition,
+)
+
+FILTER_FIELDS = ["availability", "brand"]
+
+
+class Cursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self.docs:
+            yield doc
+
+    async def to_list(self):
+        return list(self.docs)
+
+    def sort(self, *args):
+        return self
+
+    def limit(self, n):
+        return self
+
+
+class FakeCollection:
+    name = "products"
+
+    def __init__(self, indexes):
+        self.indexes = indexes
+        self.updated = []
+        self.created = []
+        self.pipelines = []
+        self.projections = []
+
+    async def list_search_indexes(self):
+        return Cursor(self.indexes)
+
+    async def update_search_index(self, name, definition):
+        self.updated.append(name)
+
+    async def create_search_indexes(self, models):
+        self.created.extend(model.document["name"] for model in models)
+
+    def find(self, filters, projection=None):
+        self.projections.append(projection)
+        return Cursor([])
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return Cursor([])
+
+
+def make_store(indexes, **options) -> MongoDBStore:
+    return MongoDBStore(
+        collection=FakeCollection(indexes),
+        embeddings=DeterministicFakeEmbedding(size=8),
+        vector_index_name="vector",
+        search_index_name="search",
+        filter_fields=FILTER_FIELDS,
+        dimensions=8,
+        **options,
+    )
+
+
+def vector_filter(store) -> dict | None:
+    return store.collection.pipelines[-1][0]["$vectorSearch"].get("filter")
+
+
+def test_outdated_indexes_are_updated_and_filters_held_back():
+    store = make_store(
+        [
+            {
+                "name": "vector",
+                "status": "READY",
+                "latestDefinition": vector_index_definition(8, []),
+            },
+            {
+                "name": "search",
+                "status": "READY",
+                "latestDefinition": search_index_definition([]),
+            },
+        ]
+    )
+
+    asyncio.run(store.hybrid_search("shoe", filters={"brand": "acme"}))
+
+    assert store.collection.updated == ["vector", "search"]
+    assert vector_filter(store) is None
+
+
+def test_filters_are_sent_once_indexes_cover_them():
+    store = make_store(
+        [
+            {
+                "name": "vector",
+                "status": "READY",
+                "latestDefinition": vector_index_definition(8, FILTER_FIELDS),
+            },
+        ]
+    )
+
+    asyncio.run(store.hybrid_search("shoe", filters={"brand": "acme", "color": "red"}))
+
+    assert store.collection.created == ["search"]
+    assert store.collection.updated == []
+    assert vector_filter(store) == {"brand": {"$eq": "acme"}}
+
+
+def test_query_leaves_embeddings_out_unless_projected():
+    store = make_store([])
+
+    asyncio.run(store.query(filters=None))
+    asyncio.run(store.query(filters=None, projection=["title"]))
+
+    assert store.collection.projections == [{"embedding": 0}, ["title"]]
+
+
+def test_hybrid_vector_leg_is_rescored_when_quantized():
+    store = make_store([], quantization="int8", rescore_factor=4)
+
+    asyncio.run(store.hybrid_search("shoe", k=3))
+
+    stages = store.collection.pipelines[-1]
+    assert stages[0]["$vectorSearch"]["limit"] == 12
+    assert stages[2] == {"$sort": {"exact_score": -1}}
+    assert stages[3] == {"$limit": 3}
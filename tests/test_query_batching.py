@@ -0,0 +1,43 @@
+import asyncio
+
+from langchain_core.embeddings import Embeddings
+
+from libs.core.embeddings.batching import BatchingEmbeddings
+
+
+class SlowEmbeddings(Embeddings):
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+        self.release = asyncio.Event()
+
+    def embed_documents(self, texts):
+        raise NotImplementedError
+
+    def embed_query(self, text):
+        raise NotImplementedError
+
+    async def aembed_documents(self, texts):
+        self.calls.append(list(texts))
+        await self.release.wait()
+        return [[float(len(text))] for text in texts]
+
+
+def test_repeated_text_joins_pending_and_in_flight_requests():
+    async def run():
+        provider = SlowEmbeddings()
+        batching = BatchingEmbeddings(provider, window_ms=1, max_batch_size=8)
+
+        first = [asyncio.create_task(batching.aembed_query(t)) for t in ("ab", "ab")]
+        await asyncio.sleep(0.01)  # window closes, batch is now in flight
+        late = asyncio.create_task(batching.aembed_query("ab"))
+        await asyncio.sleep(0.01)
+        provider.release.set()
+
+        vectors = await asyncio.gather(*first, late)
+        return provider.calls, vectors, batching.stats
+
+    calls, vectors, stats = asyncio.run(run())
+
+    assert calls == [["ab"]]
+    assert vectors == [[2.0]] * 3
+    assert stats.requests == 3
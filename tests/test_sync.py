@@ -0,0 +1,115 @@
+import asyncio
+import json
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from services.products import sync
+from services.products.ingest import SYNC_FIELD, fingerprint
+
+
+class FeedProduct(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: str
+    description: str
+    price: int
+
+
+class RecordingStore:
+    def __init__(self, products: list[FeedProduct]) -> None:
+        self.records = {
+            p.id: {"_id": p.id, SYNC_FIELD: fingerprint(p)} for p in products
+        }
+        self.upserts: list[int] = []
+        self.updates: list[int] = []
+        self.deleted: list[str] = []
+
+    async def iter_query(self, filters=None, batch_size=500, projection=None):
+        for record in self.records.values():
+            yield record
+
+    async def upsert_texts(self, ids, texts, metadatas):
+        if ids:
+            self.upserts.append(len(ids))
+
+    async def update_metadata(self, updates):
+        if updates:
+            self.updates.append(len(updates))
+
+    async def delete_many(self, keys):
+        self.deleted.extend(keys)
+
+
+@pytest.fixture(autouse=True)
+def feed_product(monkeypatch):
+    monkeypatch.setattr(sync, "Product", FeedProduct)
+
+
+def write_feed(path, rows):
+    path.write_text("\n".join(json.dumps(row) for row in rows))
+    return str(path)
+
+
+def test_metadata_updates_are_flushed_in_chunks(tmp_path):
+    existing = [FeedProduct(id=f"p{i}", description=f"d{i}", price=1) for i in range(5)]
+    store = RecordingStore(existing)
+    feed = write_feed(
+        tmp_path / "feed.jsonl",
+        [{"id": f"p{i}", "description": f"d{i}", "price": 2} for i in range(5)],
+    )
+
+    report = asyncio.run(sync.CatalogDeltaSync(store, chunk_size=2).sync(feed, "jsonl"))
+
+    assert report.metadata_updated == 5
+    assert store.updates == [2, 2, 1]
+    assert store.upserts == []
+
+
+def test_invalid_rows_do_not_delete_existing_products(tmp_path):
+    existing = [FeedProduct(id=f"p{i}", description=f"d{i}", price=1) for i in range(3)]
+    store = RecordingStore(existing)
+    feed = write_feed(
+        tmp_path / "feed.jsonl",
+        [
+            {"id": "p0", "description": "d0", "price": 1},
+            {"id": "p1", "description": "d1", "price": "not a price"},
+        ],
+    )
+
+    syncer = sync.CatalogDeltaSync(store, max_delete_ratio=0.5)
+    report = asyncio.run(syncer.sync(feed, "jsonl"))
+
+    assert report.rows_invalid == 1
+    assert store.deleted == ["p2"]
+    assert report.deleted == 1
+
+
+def test_empty_feed_deletes_nothing(tmp_path):
+    store = RecordingStore([FeedProduct(id="p0", description="d0", price=1)])
+    feed = write_feed(tmp_path / "feed.jsonl", [])
+
+    report = asyncio.run(sync.CatalogDeltaSync(store).sync(feed, "jsonl"))
+
+    assert store.deleted == []
+    assert report.deleted == 0
+    assert report.deletions_withheld == 1
+
+
+def test_truncated_feed_deletes_only_when_forced(tmp_path):
+    existing = [FeedProduct(id=f"p{i}", description=f"d{i}", price=1) for i in range(10)]
+    feed = write_feed(
+        tmp_path / "feed.jsonl",
+        [{"id": f"p{i}", "description": f"d{i}", "price": 1} for i in range(5)],
+    )
+
+    store = RecordingStore(existing)
+    report = asyncio.run(sync.CatalogDeltaSync(store).sync(feed, "jsonl"))
+    assert store.deleted == []
+    assert report.deletions_withheld == 5
+    assert report.errors
+
+    store = RecordingStore(existing)
+    report = asyncio.run(sync.CatalogDeltaSync(store).sync(feed, "jsonl", force=True))
+    assert store.deleted == [f"p{i}" for i in range(5, 10)]
+    assert report.deleted == 5